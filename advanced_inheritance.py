@@ -59,7 +59,7 @@ class Dog(Animal):
 
 class Flyable:
     def __init__(self, flight_ceiling=1000, wing_span=50):
-        self.flight_ceiling = wing_span    # Changed attribute names
+        self.flight_ceiling = flight_ceiling    # Changed attribute names
         self.wing_span = wing_span
     
     def fly(self):
@@ -143,6 +143,8 @@ class D(B, C):
 # ============================================================================
 
 class Vehicle:
+    reference_year = 2026                # year ages are measured against
+
     def __init__(self, manufacturer, year_made):
         self._manufacturer = manufacturer  # Changed from 'brand'
         self._year_made = year_made       # New attribute
@@ -153,7 +155,7 @@ class Vehicle:
     
     @property
     def age(self):                       # New property
-        return 2026 - self._year_made
+        return self.reference_year - self._year_made
 
 class Car(Vehicle):
     def __init__(self, manufacturer, year_made, car_model, engine_type):
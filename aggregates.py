@@ -0,0 +1,113 @@
+"""
+Incremental aggregates
+
+Each aggregate folds one item at a time with update(item) in O(1), so a
+running answer is always available without rescanning the data. They are
+registered on method_encapsulation.DataProcessor, which feeds every
+add_data() item to them.
+
+RunningStats - count, sum, mean, variance (Welford's algorithm), min, max
+HyperLogLog  - approximate distinct count in a fixed 2**precision bytes
+"""
+
+import hashlib
+import math
+
+
+class RunningStats:
+    def __init__(self, key=None):
+        self.key = key          # optional function turning an item into a number
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self._m2 = 0.0          # sum of squared distances from the mean
+        self.min = None
+        self.max = None
+
+    def update(self, item):
+        value = item if self.key is None else self.key(item)
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        """Population variance of the values seen so far."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def sample_variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def merge(self, other):
+        """Fold another RunningStats into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.total, self.mean, self._m2 = other.count, other.total, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def __repr__(self):
+        return (f"RunningStats(count={self.count}, total={self.total}, mean={self.mean:.6g}, "
+                f"variance={self.variance:.6g}, min={self.min}, max={self.max})")
+
+
+class HyperLogLog:
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(self._size)
+        if self._size >= 128:
+            self._alpha = 0.7213 / (1 + 1.079 / self._size)
+        else:
+            self._alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self._size]
+
+    def update(self, item):
+        # repr() keeps 1 and "1" apart and, unlike hash(), is stable across processes
+        digest = hashlib.blake2b(repr(item).encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        index = value >> (64 - self.precision)
+        remaining = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self):
+        """Estimated number of distinct items seen (about 1.04 / sqrt(2**precision) error)."""
+        estimate = self._alpha * self._size * self._size / sum(2.0 ** -r for r in self._registers)
+        if estimate <= 2.5 * self._size:
+            empty = self._registers.count(0)
+            if empty:
+                return round(self._size * math.log(self._size / empty))
+        return round(estimate)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def __repr__(self):
+        return f"HyperLogLog(precision={self.precision}, count~{self.count()})"
@@ -0,0 +1,97 @@
+"""
+Local load generator for bank_service
+
+Starts a BankService on a background thread, then drives it from many
+concurrent clients (each sends a request and waits for the reply) at several
+batch windows, reporting ops/sec and latency percentiles for each.
+
+Usage: python3 bank_loadgen.py [clients] [requests_per_client]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+
+from bank_service import AccountStore, BankService
+
+BATCH_WINDOWS = (0, 0.0005, 0.001, 0.005)
+ACCOUNTS = 8
+
+
+def start_service(store, batch_window):
+    """Run a BankService on its own event loop thread; return (service, port, stop)."""
+    loop = asyncio.new_event_loop()
+    service = BankService(store, batch_window=batch_window)
+    server = loop.run_until_complete(service.start())
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def shutdown():
+        server.close()
+        await server.wait_closed()
+        handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    return service, port, stop
+
+
+async def client(port, sessions, count, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for request_id in range(count):
+        account_number, session = random.choice(sessions)
+        request = {"id": request_id, "account": account_number, "session": session}
+        request["op"] = random.choice(("deposit", "withdraw", "get_balance"))
+        if request["op"] != "get_balance":
+            request["amount"] = random.randint(1, 50)
+        started = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(port, sessions, clients, requests_per_client):
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, sessions, requests_per_client, latencies)
+                           for _ in range(clients)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def main(clients=50, requests_per_client=200):
+    store = AccountStore()
+    sessions = []
+    for number in range(ACCOUNTS):
+        account = store.open_account(f"acct-{number}", 1_000_000, pin=1234)
+        sessions.append((account.account_number, account.open_session(1234)))
+
+    print(f"{clients} clients x {requests_per_client} requests")
+    print(f"{'window ms':>10} {'ops/sec':>10} {'avg batch':>10} {'p50 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9}")
+    for window in BATCH_WINDOWS:
+        service, port, stop = start_service(store, window)
+        elapsed, latencies = asyncio.run(run_load(port, sessions, clients, requests_per_client))
+        stop()
+        print(f"{window * 1000:>10g} {len(latencies) / elapsed:>10.0f} "
+              f"{service.requests / max(service.batches, 1):>10.1f} "
+              f"{percentile(latencies, 0.50) * 1000:>8.2f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.2f} "
+              f"{percentile(latencies, 0.999) * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,207 @@
+"""
+Asyncio banking service with request micro-batching
+
+Clients connect over a local TCP socket and send one JSON request per line:
+
+    {"id": 1, "op": "open_session", "account": "12345", "pin": 1234}
+    {"id": 2, "op": "deposit", "account": "12345", "amount": 50}
+    {"id": 3, "op": "withdraw", "account": "12345", "amount": 20, "session": "..."}
+    {"id": 4, "op": "get_balance", "account": "12345", "session": "..."}
+
+and get one JSON response per line: {"id": 2, "result": "Deposited: $50"}.
+
+Requests arriving within `batch_window` seconds of each other are grouped
+into a micro-batch and applied through AccountStore.apply_batch, which
+authorizes each run of requests for the same account and credentials once
+(BankAccount.apply_batch) instead of once per operation. open_session runs
+the slow PBKDF2 check, so it is handed to a thread instead of being batched.
+For the same reason batched operations take a session, not a pin: a pin
+would run that check inside the flush and hold up every connection.
+
+Requests are validated before they join a batch, and a run that still fails
+answers its own requests with an error, so one bad request never leaves the
+rest of its batch without a reply.
+"""
+
+import asyncio
+import json
+import math
+
+from method_encapsulation import BankAccount
+
+BATCHED_OPERATIONS = ("deposit", "withdraw", "get_balance")
+
+
+def _validate(request):
+    """An error message for a request that cannot be applied, or None."""
+    if not isinstance(request.get("account"), str):
+        return "Invalid account"
+    if not isinstance(request.get("session", ""), str):
+        return "Invalid session"
+    op = request.get("op")
+    if op == "open_session":
+        return None
+    if "pin" in request:
+        return "Batched operations take a session; call open_session first"
+    if op != "get_balance":
+        amount = request.get("amount")
+        # ints are exact at any size; math.isfinite() would overflow on a huge one
+        if type(amount) is not int and (type(amount) is not float or not math.isfinite(amount)):
+            return "Invalid amount"
+    return None
+
+
+class AccountStore:
+    def __init__(self):
+        self._accounts = {}
+
+    def open_account(self, account_number, initial_balance=0, pin=None):
+        account = BankAccount(account_number, initial_balance)
+        if pin is not None:
+            account.set_pin(pin)
+        self._accounts[account_number] = account
+        return account
+
+    def get(self, account_number):
+        return self._accounts.get(account_number)
+
+    def apply_batch(self, requests):
+        """
+        Apply a list of request dicts and return their results in the same order.
+        Requests for one account keep their relative order; consecutive requests
+        with the same credentials share a single authorization. A request that
+        fails _validate() gets its error message and the others still apply.
+        """
+        results = [None] * len(requests)
+        by_account = {}
+        for index, request in enumerate(requests):
+            error = _validate(request)
+            if error is None:
+                by_account.setdefault(request["account"], []).append(index)
+            else:
+                results[index] = error
+
+        for account_number, indices in by_account.items():
+            account = self._accounts.get(account_number)
+            if account is None:
+                for index in indices:
+                    results[index] = "Unknown account"
+                continue
+            run_start = 0
+            while run_start < len(indices):
+                first = requests[indices[run_start]]
+                credentials = (first.get("pin"), first.get("session"))
+                run_end = run_start + 1
+                while run_end < len(indices):
+                    request = requests[indices[run_end]]
+                    if (request.get("pin"), request.get("session")) != credentials:
+                        break
+                    run_end += 1
+                run = indices[run_start:run_end]
+                operations = [(requests[i]["op"], requests[i].get("amount", 0)) for i in run]
+                try:
+                    run_results = account.apply_batch(operations, *credentials)
+                except Exception as error:
+                    run_results = [f"Error: {error}"] * len(run)
+                for index, result in zip(run, run_results):
+                    results[index] = result
+                run_start = run_end
+        return results
+
+
+class BankService:
+    def __init__(self, store, batch_window=0.001, max_batch=1024):
+        self.store = store
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._pending = []          # (request, writer) waiting for the next flush
+        self._flush_handle = None
+        self._tasks = set()         # running open_session tasks, kept alive until done
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening and return the asyncio server (port 0 picks a free port)."""
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def _handle_client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if not isinstance(request, dict):
+                    self._respond(writer, None, "Malformed request")
+                    continue
+                op = request.get("op")
+                error = _validate(request) if op in BATCHED_OPERATIONS or op == "open_session" else None
+                if error is not None:
+                    self._respond(writer, request.get("id"), error)
+                elif op in BATCHED_OPERATIONS:
+                    self._enqueue(request, writer, loop)
+                elif op == "open_session":
+                    task = loop.create_task(self._open_session(request, writer))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                else:
+                    self._respond(writer, request.get("id"), f"Unknown operation: {op}")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _open_session(self, request, writer):
+        account = self.store.get(request.get("account"))
+        if account is None:
+            result = "Unknown account"
+        else:
+            result = await asyncio.to_thread(account.open_session, request.get("pin"))
+        self._respond(writer, request.get("id"), result)
+
+    def _enqueue(self, request, writer, loop):
+        self._pending.append((request, writer))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.batch_window > 0:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            results = self.store.apply_batch([request for request, _ in pending])
+        except Exception as error:
+            results = [f"Error: {error}"] * len(pending)
+        self.batches += 1
+        self.requests += len(pending)
+        for (request, writer), result in zip(pending, results):
+            self._respond(writer, request.get("id"), result)
+
+    @staticmethod
+    def _respond(writer, request_id, result):
+        if not writer.is_closing():
+            writer.write(json.dumps({"id": request_id, "result": result}).encode() + b"\n")
+
+
+async def serve(host="127.0.0.1", port=8765, batch_window=0.001):
+    store = AccountStore()
+    store.open_account("12345", 1000, pin=1234)
+    service = BankService(store, batch_window=batch_window)
+    server = await service.start(host, port)
+    print(f"Serving on {host}:{port} (batch window {batch_window * 1000:g} ms)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,103 @@
+"""
+Bounded caching helpers
+
+LRUCache keeps at most `max_size` entries and evicts the least recently
+used one when full. An optional `ttl` (seconds) makes entries expire so a
+stale value is never served, which is what the verified-session cache in
+method_encapsulation.BankAccount relies on.
+
+Entries can also record the range of an underlying sequence they were
+computed from (`depends_on=(start, stop)`, stop=None meaning "to the end").
+invalidate_range() then drops only the entries that overlap a change, which
+lets method_encapsulation.DataProcessor keep results over untouched data
+across appends.
+"""
+
+import time
+from collections import OrderedDict
+
+# Returned by get() when the caller needs to tell "absent" from a cached None
+MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, max_size=128, ttl=None, clock=time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (value, expires_at, depends_on)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, depends_on=None):
+        """
+        Store value under key, evicting the least recently used entry if full.
+        depends_on is an optional (start, stop) range the value was derived from.
+        """
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (value, expires_at, depends_on)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def invalidate_range(self, start, stop=None):
+        """
+        Drop every entry whose dependency range overlaps [start, stop).
+        Entries stored without depends_on are left alone.
+        """
+        stale = []
+        for key, (_, _, depends_on) in self._entries.items():
+            if depends_on is None:
+                continue
+            dep_start, dep_stop = depends_on
+            if (dep_stop is None or start < dep_stop) and (stop is None or dep_start < stop):
+                stale.append(key)
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self):
+        """Return the hit/miss/eviction/invalidation counters and current size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self._entries),
+        }
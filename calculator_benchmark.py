@@ -0,0 +1,50 @@
+"""
+Calculator summation benchmark
+
+Times the scalar add() loop against add_many() and add_stream() with each
+accumulation method, and reports every result's error relative to
+math.fsum over the same values.
+
+Usage: python3 calculator_benchmark.py [count]
+"""
+
+import math
+import random
+import sys
+import time
+from array import array
+
+from method_encapsulation import Calculator, np
+
+
+def run(label, func, expected):
+    calc = Calculator()
+    start = time.perf_counter()
+    func(calc)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms   error {calc.result - expected:+.3e}")
+    return elapsed
+
+
+def main(count=1_000_000):
+    random.seed(42)
+    values = [random.uniform(-1e6, 1e6) * 10 ** random.randint(-8, 8) for _ in range(count)]
+    buffer = array("d", values)
+    expected = math.fsum(values)
+
+    print(f"{count:,} floats, exact sum {expected!r}")
+    scalar = run("add() loop", lambda calc: [calc.add(v) for v in values], expected)
+    for method in ("fast", "kahan", "fsum"):
+        elapsed = run(f"add_many(list, {method})", lambda calc: calc.add_many(values, method), expected)
+        run(f"add_many(array, {method})", lambda calc: calc.add_many(buffer, method), expected)
+        run(f"add_stream({method})",
+            lambda calc: [None for _ in calc.add_stream(iter(values), method=method)], expected)
+        print(f"{'':<28} speed-up vs add(): {scalar / elapsed:.1f}x")
+    if np is not None:
+        arr = np.array(values)
+        elapsed = run("add_many(ndarray, fast)", lambda calc: calc.add_many(arr), expected)
+        print(f"{'':<28} speed-up vs add(): {scalar / elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
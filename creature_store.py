@@ -0,0 +1,322 @@
+"""
+Columnar creature store
+
+Asking a population of creature objects "which can fly above 400m?" means an
+isinstance() check and an attribute read per object. CreatureStore keeps the
+same data as columns keyed by creature_id, one column set per component:
+
+    animal    - habitat, species, kind, and a dog's owner and breed, as codes
+                into small category tables
+    flyable   - flight_ceiling and wing_span
+    swimmable - dive_limit and swim_speed
+
+Columns are array.array buffers. A capability bitmask records which
+components each creature has; the numeric columns of a missing component
+hold NaN, so a threshold comparison is false for those rows without any
+extra check. With NumPy installed, queries are vectorized comparisons over
+zero-copy views of the column buffers. Without it, threshold and range
+queries bisect a sorted index built on first use and kept until the next
+add(), so a query costs O(log n + matches) instead of a pass over every
+creature.
+
+store[creature_id] returns a CreatureView with the attribute and method
+names of the classes in advanced_inheritance.py, reading from the columns.
+A kind column records which of those classes a creature came from (Animal,
+Dog or Duck, matched by class name so the compact_creatures versions count
+too), and the view's speak() answers the way that class does. Dogs keep
+their owner and breed.
+"""
+
+import math
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FLYABLE = 1
+SWIMMABLE = 2
+COMPONENTS = {
+    "flyable": (FLYABLE, ("flight_ceiling", "wing_span")),
+    "swimmable": (SWIMMABLE, ("dive_limit", "swim_speed")),
+}
+CATEGORIES = ("habitat", "species", "kind", "owner", "breed")
+_COMPARISONS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+                "==": operator.eq, "!=": operator.ne}
+_NAN = math.nan
+KINDS = ("Animal", "Dog", "Duck")       # classes whose speak() the view reproduces
+_SPEAK = {
+    "Animal": "Creature {0} from {1} makes a sound",
+    "Dog": "Creature {0} from {1} makes a sound - Woof! (Owner: {2})",
+    "Duck": "Duck {0} from {1} says Quack!",
+}
+
+
+def _plain(number):
+    """A float column value printed like the int it usually was: 500.0 -> 500, 1e6 -> 1000000."""
+    return int(number) if number.is_integer() else number
+
+
+class CreatureStore:
+    def __init__(self):
+        self.ids = []                       # row -> creature_id
+        self.rows = {}                      # creature_id -> row
+        self.capabilities = array("B")      # row -> FLYABLE | SWIMMABLE bits
+        self.categories = {name: [] for name in CATEGORIES}    # code -> value
+        self._codes = {name: {} for name in CATEGORIES}         # value -> code
+        self.columns = {name: array("I") for name in CATEGORIES}
+        self._kinds = {}                    # class -> kind name, for add_creature
+        for _, names in COMPONENTS.values():
+            for name in names:
+                self.columns[name] = array("d")
+        self._indexes = {}                  # column -> (sorted values, rows in that order)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, creature_id):
+        return creature_id in self.rows
+
+    def __getitem__(self, creature_id):
+        return CreatureView(self, self.rows[creature_id])
+
+    def _code(self, category, value):
+        codes = self._codes[category]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[category])
+            self.categories[category].append(value)
+        return code
+
+    def add(self, creature_id, habitat, species, flyable=None, swimmable=None, kind="Animal",
+            owner=None, breed=None):
+        """
+        Add a creature. flyable is (flight_ceiling, wing_span) and swimmable is
+        (dive_limit, swim_speed), or None when the creature lacks the component.
+        kind is one of KINDS; owner and breed are for dogs.
+        """
+        if kind not in _SPEAK:
+            raise ValueError(f"unknown kind {kind!r}, expected one of {KINDS}")
+        if creature_id in self.rows:
+            raise KeyError(f"creature {creature_id!r} is already in the store")
+        # Check and convert everything first, so a rejected creature leaves no partial row behind
+        bits = 0
+        numbers = []
+        for component, values in (("flyable", flyable), ("swimmable", swimmable)):
+            bit, names = COMPONENTS[component]
+            if values is None:
+                numbers += (_NAN, _NAN)
+                continue
+            values = tuple(values)
+            if len(values) != 2:
+                raise ValueError(f"{component} must be ({', '.join(names)}), got {values!r}")
+            numbers += map(float, values)
+            bits |= bit
+        codes = [self._code(name, value) for name, value in zip(CATEGORIES, (habitat, species, kind, owner, breed))]
+        self.rows[creature_id] = len(self.ids)
+        self.ids.append(creature_id)
+        columns = self.columns
+        for name, code in zip(CATEGORIES, codes):
+            columns[name].append(code)
+        for name, number in zip((name for _, names in COMPONENTS.values() for name in names), numbers):
+            columns[name].append(number)
+        self.capabilities.append(bits)
+        self._indexes.clear()
+
+    def add_creature(self, creature):
+        """Add an instance of the Animal classes; Flyable/Swimmable data is read if present."""
+        flyable = (creature.flight_ceiling, creature.wing_span) if hasattr(creature, "fly") else None
+        swimmable = (creature.dive_limit, creature.swim_speed) if hasattr(creature, "swim") else None
+        cls = type(creature)
+        kind = self._kinds.get(cls)
+        if kind is None:
+            names = [klass.__name__ for klass in cls.__mro__]
+            kind = self._kinds[cls] = next((name for name in names if name in _SPEAK and name != "Animal"),
+                                           "Animal")
+        self.add(creature.creature_id, creature.habitat, creature.species, flyable, swimmable, kind,
+                 getattr(creature, "owner", None), getattr(creature, "breed", None))
+
+    def extend(self, creatures):
+        for creature in creatures:
+            self.add_creature(creature)
+
+    def _select(self, mask):
+        return list(compress(self.ids, mask))
+
+    def where(self, column, op, value):
+        """creature_ids whose column compares true against value, e.g. where("dive_limit", ">", 5)."""
+        compare = _COMPARISONS[op]
+        if column in self.categories:
+            if op not in ("==", "!="):
+                raise ValueError(f"{column} only supports == and !=")
+            value = self._codes[column].get(value, -1)
+        data = self.columns[column]
+        numeric = column not in self.categories
+        if np is not None:
+            values = np.frombuffer(data, dtype=data.typecode)
+            mask = compare(values, value)
+            if op == "!=" and numeric:
+                mask &= values == values        # NaN marks a missing component, not a value
+            return self._select(mask.tolist())
+        if op == "!=" and numeric:
+            return self._select(map(operator.and_, map(compare, data, repeat(value)), map(operator.eq, data, data)))
+        if op in ("==", "!="):
+            return self._select(map(compare, data, repeat(value)))
+        values, order = self._index(column)
+        if op in (">", ">="):
+            rows = order[(bisect_right if op == ">" else bisect_left)(values, value):]
+        else:
+            rows = order[:(bisect_left if op == "<" else bisect_right)(values, value)]
+        rows.sort()
+        return list(map(self.ids.__getitem__, rows))
+
+    def with_capability(self, bits):
+        """creature_ids having every capability in bits (FLYABLE, SWIMMABLE or both)."""
+        return self._select(map(bits.__eq__, map(bits.__and__, self.capabilities)))
+
+    def can_fly_above(self, height):
+        return self.where("flight_ceiling", ">", height)
+
+    def can_swim_deeper_than(self, depth):
+        return self.where("dive_limit", ">", depth)
+
+    def _index(self, column):
+        index = self._indexes.get(column)
+        if index is None:
+            data = self.columns[column]
+            order = sorted((row for row in range(len(data)) if data[row] == data[row]), key=data.__getitem__)
+            index = self._indexes[column] = ([data[row] for row in order], order)
+        return index
+
+    def between(self, column, low, high):
+        """creature_ids with low <= column <= high, answered from a sorted index (NaN rows excluded)."""
+        values, order = self._index(column)
+        rows = order[bisect_left(values, low):bisect_right(values, high)]
+        rows.sort()
+        return list(map(self.ids.__getitem__, rows))
+
+
+class CreatureView:
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __repr__(self):
+        return f"<CreatureView {self.creature_id!r} ({self.species})>"
+
+    def _column(self, name, bit=0):
+        if bit and not self.store.capabilities[self.row] & bit:
+            raise AttributeError(f"{self.creature_id!r} has no {name}")
+        return self.store.columns[name][self.row]
+
+    @property
+    def creature_id(self):
+        return self.store.ids[self.row]
+
+    def _category(self, name):
+        return self.store.categories[name][self.store.columns[name][self.row]]
+
+    @property
+    def habitat(self):
+        return self._category("habitat")
+
+    @property
+    def species(self):
+        return self._category("species")
+
+    @property
+    def kind(self):
+        return self._category("kind")
+
+    @property
+    def owner(self):
+        if self.kind != "Dog":
+            raise AttributeError(f"{self.creature_id!r} is not a dog")
+        return self._category("owner")
+
+    @property
+    def breed(self):
+        if self.kind != "Dog":
+            raise AttributeError(f"{self.creature_id!r} is not a dog")
+        return self._category("breed")
+
+    @property
+    def flight_ceiling(self):
+        return self._column("flight_ceiling", FLYABLE)
+
+    @property
+    def wing_span(self):
+        return self._column("wing_span", FLYABLE)
+
+    @property
+    def dive_limit(self):
+        return self._column("dive_limit", SWIMMABLE)
+
+    @property
+    def swim_speed(self):
+        return self._column("swim_speed", SWIMMABLE)
+
+    def speak(self):
+        return _SPEAK[self.kind].format(self.creature_id, self.habitat, self._category("owner"))
+
+    def fly(self):
+        return f"Flying with {_plain(self.wing_span)}cm wings up to {_plain(self.flight_ceiling)}m"
+
+    def swim(self):
+        return f"Swimming at {_plain(self.swim_speed)}km/h down to {_plain(self.dive_limit)}m"
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from compact_creatures import Animal, Dog, Flyable, Swimmable
+
+    class WildBird(Animal, Flyable, Swimmable):
+        __slots__ = ("flight_ceiling", "wing_span", "dive_limit", "swim_speed")
+
+        def __init__(self, creature_id, habitat, flight_ceiling, wing_span, dive_limit, swim_speed):
+            super().__init__(creature_id, habitat, "Waterfowl")
+            self.flight_ceiling, self.wing_span = flight_ceiling, wing_span
+            self.dive_limit, self.swim_speed = dive_limit, swim_speed
+
+    rng = random.Random(3)
+    population = []
+    for number in range(1_000_000):
+        if rng.random() < 0.4:
+            population.append(Dog(f"dog{number}", "John Smith", "Golden Retriever"))
+        else:
+            population.append(WildBird(f"bird{number}", rng.choice(["Central Park Pond", "Lake Oguta"]),
+                                       rng.uniform(0, 1000), rng.uniform(20, 120),
+                                       rng.uniform(0, 10), rng.uniform(1, 5)))
+
+    store = CreatureStore()
+    started = time.perf_counter()
+    store.extend(population)
+    print(f"loaded {len(store):,} creatures in {time.perf_counter() - started:.2f}s")
+    print(store["bird1"], store["bird1"].fly())
+
+    queries = [("fly above", Flyable, "flight_ceiling", store.can_fly_above),
+               ("dive below", Swimmable, "dive_limit", store.can_swim_deeper_than)]
+    for label, capability, attribute, query in queries:
+        for threshold in ((990, 999) if attribute == "flight_ceiling" else (9.9, 9.99)):
+            started = time.perf_counter()
+            per_object = [c.creature_id for c in population
+                          if isinstance(c, capability) and getattr(c, attribute) > threshold]
+            scanned = time.perf_counter() - started
+            timings = []
+            for _ in range(2):
+                started = time.perf_counter()
+                columnar = query(threshold)
+                timings.append(time.perf_counter() - started)
+            assert per_object == columnar
+            print(f"{label} {threshold}: {len(columnar):,} matches, isinstance loop {scanned:.3f}s, "
+                  f"store {timings[0]:.3f}s first (index build), {timings[1]:.4f}s after")
+    print(f"both capabilities: {len(store.with_capability(FLYABLE | SWIMMABLE)):,}, "
+          f"ceiling in [100, 600]: {len(store.between('flight_ceiling', 100, 600)):,}")
@@ -0,0 +1,166 @@
+"""
+Low-overhead exception capture
+
+except1.py keeps every caught exception (`except KeyError as e:
+store.append(e)`). Each stored exception holds its traceback, the traceback
+holds every frame it passed through, and the frames hold their local
+variables - so a list of errors can pin far more memory than the errors
+themselves. ErrorCapture keeps only what a report needs:
+
+    errors = ErrorCapture()
+    with errors.catching(KeyError, ZeroDivisionError):
+        {}['foo']
+    print(errors.records[0])
+
+Each ErrorRecord stores the exception class, its message and the stack as a
+tuple of (filename, line, function) tuples. Frame tuples and whole stacks are
+interned, so a million errors raised from the same place share one stack.
+The traceback is dropped from the exception as soon as it has been read, and
+source lines are looked up only when a record is formatted.
+"""
+
+import linecache
+from collections import deque
+from contextlib import contextmanager
+
+
+class ErrorRecord:
+    __slots__ = ("exc_type", "message", "stack", "cause", "explicit_cause")
+
+    def __init__(self, exc_type, message, stack, cause=None, explicit_cause=False):
+        self.exc_type = exc_type
+        self.message = message
+        self.stack = stack          # ((filename, lineno, function), ...) outermost first
+        self.cause = cause          # ErrorRecord for __cause__/__context__, if any
+        self.explicit_cause = explicit_cause    # True for "raise ... from cause"
+
+    def __repr__(self):
+        where = f" at {self.stack[-1][0]}:{self.stack[-1][1]}" if self.stack else ""
+        return f"<ErrorRecord {self.exc_type.__name__}: {self.message}{where}>"
+
+    def format(self):
+        """Render like traceback.format_exception(), reading source lines only now."""
+        lines = []
+        if self.cause is not None:
+            lines.extend(self.cause.format())
+            if self.explicit_cause:
+                lines.append("\nThe above exception was the direct cause of the following exception:\n\n")
+            else:
+                lines.append("\nDuring handling of the above exception, another exception occurred:\n\n")
+        if self.stack:
+            lines.append("Traceback (most recent call last):\n")
+        for filename, lineno, function in self.stack:
+            lines.append(f'  File "{filename}", line {lineno}, in {function}\n')
+            source = linecache.getline(filename, lineno).strip()
+            if source:
+                lines.append(f"    {source}\n")
+        name = self.exc_type.__qualname__
+        if self.exc_type.__module__ not in ("builtins", "__main__"):
+            name = f"{self.exc_type.__module__}.{name}"
+        lines.append(f"{name}: {self.message}\n" if self.message else f"{name}\n")
+        return lines
+
+    def __str__(self):
+        return "".join(self.format())
+
+
+class ErrorCapture:
+    def __init__(self, limit=None, max_records=None):
+        self.limit = limit              # innermost frames kept per stack, None for all
+        self.records = deque(maxlen=max_records)    # oldest records are dropped beyond max_records
+        self.dropped = 0
+        self._frames = {}               # interning tables: frame tuple -> itself, stack -> itself
+        self._stacks = {}
+
+    def _stack(self, traceback):
+        frames = self._frames
+        stack = []
+        while traceback is not None:
+            code = traceback.tb_frame.f_code
+            frame = (code.co_filename, traceback.tb_lineno, code.co_name)
+            stack.append(frames.setdefault(frame, frame))
+            traceback = traceback.tb_next
+        if self.limit is not None:
+            stack = stack[-self.limit:]
+        stack = tuple(stack)
+        return self._stacks.setdefault(stack, stack)
+
+    def summarize(self, exc, _seen=None):
+        """Build an ErrorRecord for exc (and its chained causes) and release the tracebacks."""
+        seen = _seen if _seen is not None else set()
+        seen.add(id(exc))
+        chained = exc.__cause__ or (None if exc.__suppress_context__ else exc.__context__)
+        cause = None
+        if chained is not None and id(chained) not in seen:
+            cause = self.summarize(chained, seen)
+        record = ErrorRecord(type(exc), str(exc), self._stack(exc.__traceback__), cause,
+                             exc.__cause__ is not None)
+        exc.__traceback__ = None
+        return record
+
+    def capture(self, exc):
+        record = self.summarize(exc)
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(record)
+        return record
+
+    @contextmanager
+    def catching(self, *exception_types):
+        """Capture and suppress the given exception types (default: Exception) raised in the block."""
+        try:
+            yield self
+        except exception_types or Exception as exc:
+            self.capture(exc)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def _fail(depth):
+    # Locals like this buffer stay alive for as long as a stored traceback references the frame
+    buffer = bytearray(4096)
+    if depth:
+        return _fail(depth - 1)
+    raise KeyError(f"missing key in {len(buffer)}-byte buffer")
+
+
+if __name__ == "__main__":
+    import gc
+    import time
+    import tracemalloc
+
+    errors = ErrorCapture()
+    with errors.catching(KeyError):
+        {}['foo']
+    with errors.catching(ZeroDivisionError):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            raise ZeroDivisionError("retry failed")
+    print(errors.records)
+    print(errors.records[1])
+
+    count = 20_000
+    for label in ("raw exceptions", "ErrorCapture"):
+        gc.collect()
+        tracemalloc.start()
+        errors = ErrorCapture()
+        stored = []
+        started = time.perf_counter()
+        for _ in range(count):
+            try:
+                _fail(3)
+            except KeyError as e:
+                if label == "raw exceptions":
+                    stored.append(e)
+                else:
+                    errors.capture(e)
+        elapsed = time.perf_counter() - started
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{label:>14}: {elapsed / count * 1e6:5.1f} us and {memory / count:8,.0f} bytes per captured error")
+        del stored, errors
@@ -0,0 +1,190 @@
+"""
+Aggregated exception reports
+
+except1.py prints the hierarchy of every caught exception by walking
+ec.__bases__[0] up to BaseException, once per exception object, and skips
+any second base class. ErrorAggregator is meant for millions of events:
+
+    report = ErrorAggregator()
+    report.record_many(caught_exceptions)
+    print(report.render())
+
+- recording an event is one counter increment for its exact class
+- totals per ancestor (a class plus all its subclasses) are derived on
+  demand from the cached MRO path of each distinct class, and cached until
+  the next event, so their cost depends on the number of distinct classes
+  rather than on the number of events
+- render() draws the indented tree with counts, following every base class,
+  not only the first
+- counts from several processes combine with merge(), either from another
+  aggregator or from its picklable/JSON-friendly state()
+"""
+
+import importlib
+from collections import Counter
+
+
+def _class_of(event):
+    if isinstance(event, type):
+        return event
+    # error_capture.ErrorRecord keeps the class of the exception it summarizes
+    return getattr(event, "exc_type", None) or type(event)
+
+
+def _qualified_name(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _resolve(name):
+    module, _, qualname = name.rpartition(".")
+    # Walk back until the module part imports, for nested classes like mod.Outer.Inner
+    while module:
+        try:
+            target = importlib.import_module(module)
+            break
+        except ImportError:
+            module, _, outer = module.rpartition(".")
+            qualname = f"{outer}.{qualname}"
+    else:
+        raise LookupError(f"cannot resolve exception class {name!r}")
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class ErrorAggregator:
+    _paths = {}                     # class -> its exception ancestors, shared by every aggregator
+
+    def __init__(self):
+        self.counts = Counter()     # exact class -> number of events
+        self._totals = None         # cached ancestor totals, dropped on every change
+
+    @classmethod
+    def path(cls, exception_class):
+        """The class and its exception ancestors in MRO order, computed once per class."""
+        path = cls._paths.get(exception_class)
+        if path is None:
+            path = cls._paths[exception_class] = tuple(
+                base for base in exception_class.__mro__ if issubclass(base, BaseException))
+        return path
+
+    def record(self, event):
+        """Count one exception instance, exception class or error_capture.ErrorRecord."""
+        self.counts[_class_of(event)] += 1
+        self._totals = None
+
+    def record_many(self, events):
+        self.counts.update(map(_class_of, events))
+        self._totals = None
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def totals(self):
+        """Map every class seen, and every ancestor, to its count including subclasses."""
+        if self._totals is None:
+            totals = Counter()
+            for exception_class, count in self.counts.items():
+                for ancestor in self.path(exception_class):
+                    totals[ancestor] += count
+            self._totals = totals
+        return self._totals
+
+    def total(self, exception_class):
+        """Events of this class or any subclass."""
+        return self.totals()[exception_class]
+
+    def state(self):
+        """Counts keyed by qualified class name, safe to pickle or dump as JSON."""
+        return {_qualified_name(cls): count for cls, count in self.counts.items()}
+
+    def merge(self, other):
+        """Add the counts of another aggregator, or of a state() dict from another process."""
+        if isinstance(other, ErrorAggregator):
+            self.counts.update(other.counts)
+        else:
+            self.counts.update({_resolve(name): count for name, count in other.items()})
+        self._totals = None
+        return self
+
+    def render(self, root=BaseException):
+        """
+        Indented hierarchy of everything recorded, with totals and, where they
+        differ, the count of the class itself. A class with several exception
+        bases is listed under each; its subtree is expanded only the first time.
+        """
+        totals = self.totals()
+        children = {}
+        for exception_class in totals:
+            for base in exception_class.__bases__:
+                if base in totals:
+                    children.setdefault(base, []).append(exception_class)
+        lines = []
+        expanded = set()
+        stack = [(root, 0)] if root in totals else []
+        while stack:
+            exception_class, depth = stack.pop()
+            own = self.counts[exception_class]
+            label = exception_class.__name__ + f": {totals[exception_class]}"
+            if own and own != totals[exception_class]:
+                label += f" ({own} directly)"
+            if exception_class in expanded:
+                label += " [see above]"
+            lines.append(("   " * (depth - 1) + " +-" if depth else "") + label)
+            if exception_class in expanded:
+                continue
+            expanded.add(exception_class)
+            below = sorted(children.get(exception_class, ()), key=lambda c: (-totals[c], c.__name__))
+            stack.extend((child, depth + 1) for child in reversed(below))
+        return "\n".join(lines)
+
+
+def _worker_counts(seed):
+    events = _sample_events(200_000, seed)
+    report = ErrorAggregator()
+    report.record_many(events)
+    return report.state()
+
+
+def _sample_events(count, seed):
+    import io
+    import random
+
+    rng = random.Random(seed)
+    kinds = [KeyError("foo"), ZeroDivisionError("division by zero"), AttributeError("bar"),
+             FileNotFoundError("tes.txt"), UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid"),
+             ConnectionResetError(), TimeoutError(), io.UnsupportedOperation("not readable")]
+    return [rng.choice(kinds) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    import time
+    from multiprocessing import Pool
+
+    events = _sample_events(1_000_000, seed=0)
+
+    started = time.perf_counter()
+    walked = Counter()
+    for exception_object in events:
+        ec = exception_object.__class__
+        walked[ec] += 1
+        while ec.__bases__:
+            ec = ec.__bases__[0]
+            walked[ec] += 1
+    walk = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = ErrorAggregator()
+    report.record_many(events)
+    totals = report.totals()
+    aggregated = time.perf_counter() - started
+    print(f"{len(events):,} events: __bases__[0] walk {walk:.2f}s, ErrorAggregator {aggregated:.2f}s")
+    # io.UnsupportedOperation derives from OSError and ValueError; the first-base walk misses the second
+    print(f"ValueError totals: first-base walk {walked[ValueError]:,}, full MRO {totals[ValueError]:,}")
+
+    with Pool(2) as pool:
+        merged = ErrorAggregator()
+        for state in pool.map(_worker_counts, range(4)):
+            merged.merge(state)
+    print(f"\nmerged from 4 workers ({len(merged):,} events):")
+    print(merged.render())
@@ -1,11 +1,58 @@
-def divide_by(x, y):
-   return x / y
-
-def divide_by(x, y):
-   try:
-      return divide_by(x, y)
-   except ZeroDivisionError:
-      return 1000000000000000
-
-print("Safe 3 / 2 = {0:g}".format(divide_by(3, 2)))
-print(f"Safe 3 / 2 = {0:g}".format(divide_by(3, 2)))
\ No newline at end of file
+try:
+   import numpy as np
+except ImportError:
+   np = None
+
+#value returned in place of x / 0
+SENTINEL = 1000000000000000
+
+
+def _divide(x, y):
+   return x / y
+
+def divide_by(x, y):
+   try:
+      return _divide(x, y)
+   except ZeroDivisionError:
+      return SENTINEL
+
+def safe_divide(x, y, fill=SENTINEL):
+   """
+   x / y without raising on zero denominators: positions where y == 0 get
+   `fill` (SENTINEL, float("inf"), float("nan"), ...). Accepts scalars, NumPy
+   arrays (broadcast, divided in one masked ufunc call) or plain sequences,
+   and checks the denominators instead of catching ZeroDivisionError.
+   """
+   if np is not None and (isinstance(x, np.ndarray) or isinstance(y, np.ndarray)):
+      x, y = np.asarray(x), np.asarray(y)
+      out = np.full(np.broadcast_shapes(x.shape, y.shape), fill, dtype=np.result_type(x, y, 1.0))
+      return np.divide(x, y, out=out, where=y != 0)
+   x_many, y_many = hasattr(x, "__iter__"), hasattr(y, "__iter__")
+   if x_many and y_many:
+      return [a / b if b else fill for a, b in zip(x, y, strict=True)]
+   if x_many:
+      return [a / y if y else fill for a in x]
+   if y_many:
+      return [x / b if b else fill for b in y]
+   return x / y if y else fill
+
+
+if __name__ == "__main__":
+   import random
+   import timeit
+
+   print("Safe 3 / 2 = {0:g}".format(divide_by(3, 2)))
+   print(f"Safe 3 / 0 = {divide_by(3, 0):g}")
+   print(safe_divide([6, 1, 0], [3, 0, 0], fill=float("nan")))
+
+   rng = random.Random(0)
+   count = 1_000_000
+   numerators = [rng.random() for _ in range(count)]
+   denominators = [rng.choice((0.0, rng.random())) for _ in range(count)]
+   looped = min(timeit.repeat(lambda: [divide_by(a, b) for a, b in zip(numerators, denominators)], number=1, repeat=3))
+   listed = min(timeit.repeat(lambda: safe_divide(numerators, denominators), number=1, repeat=3))
+   print(f"{count:,} divisions, half by zero: try/except loop {looped:.3f}s, safe_divide on lists {listed:.3f}s")
+   if np is not None:
+      x, y = np.array(numerators), np.array(denominators)
+      vectorized = min(timeit.repeat(lambda: safe_divide(x, y), number=1, repeat=3))
+      print(f"safe_divide on arrays {vectorized:.4f}s ({looped / vectorized:,.0f}x faster than the loop)")
@@ -0,0 +1,271 @@
+"""
+Compiled format templates and bulk integer column formatting
+
+compile_template() parses a template such as "{0:05d} {0:#x} {1:,}" once and
+turns it into an equivalent f-string function (cached per template), which
+is what format_rows() builds on. Called once per value it is no faster than
+str.format: the parse it saves costs about as much as the extra Python call
+(measured on 3.11: up to 1.2x for multi-field templates, slower for a single
+field).
+The speed-up is in rendering whole columns.
+
+format_rows() and format_column() render a batch of rows with a single "%"
+operation on a repeated row format. Fields that map onto a printf-style
+conversion (05d, +d, x, #x, o, X, plain {0}) cost no Python-level work per
+value, which makes those columns about 2.5-3x faster than per-value
+.format. The rest (b, thousands "," and "_", centring) are pre-rendered per
+column by a generated list comprehension and spliced in through %s; the
+per-value int formatting dominates there, so rows containing them gain
+only 1.1-1.3x. (Bulk string tricks - bin() plus replace, a regex inserting
+the commas - were measured and are slower than the comprehension.) The spec
+families from integer_formatting.py have names in COLUMN_SPECS.
+"""
+
+import io
+import keyword
+import re
+import string
+from functools import lru_cache
+from itertools import chain, islice
+
+COLUMN_SPECS = {
+    "zero_padded": "05d",
+    "signed": "+d",
+    "binary": "b",
+    "octal": "o",
+    "hex": "x",
+    "hex_upper": "X",
+    "hex_prefixed": "#x",
+    "thousands": ",",
+    "underscore": "_",
+}
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+_INDEX = re.compile(r"[0-9]+\Z")
+# Names the generated render function uses itself; a field with one of them takes the slow path
+_RESERVED = re.compile(r"_p[0-9]+\Z|_extra_(?:args|kwargs)\Z")
+# Format specs with an exact printf-style equivalent ("<" maps to the "-" flag)
+_PRINTF_SPEC = re.compile(r"(?P<align>[<>]?)(?P<sign>[+ ]?)(?P<alt>#?)(?P<zero>0?)(?P<width>\d*)(?P<type>[dxXo])\Z")
+_INT_TYPES = {int, bool}
+# Characters that cannot appear verbatim inside an f-string replacement field
+_UNSAFE_SPEC = re.compile(r"[{}'\"\\\n]")
+
+
+def _literal(text):
+    """Return text as an f-string literal piece (braces doubled, quotes escaped)."""
+    source = repr(text)
+    return "f" + source[0] + source[1:-1].replace("{", "{{").replace("}", "}}") + source[-1]
+
+
+def _parse_template(template):
+    """
+    Translate a str.format template into f-string source.
+    Returns (expression, positional_count, names), or None when the template
+    uses attribute/index access, nested specs or field names that cannot be
+    parameters (keywords, or the generated _p0, _extra_args, ...), which
+    need the slow path.
+    """
+    pieces = []
+    positional = 0
+    names = []
+    auto_index = 0
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if literal:
+            pieces.append(_literal(literal))
+        if field is None:
+            continue
+        if field == "":
+            field = str(auto_index)
+            auto_index += 1
+        if _INDEX.match(field):
+            expression = f"_p{int(field)}"
+            positional = max(positional, int(field) + 1)
+        elif _IDENTIFIER.match(field) and not keyword.iskeyword(field) and not _RESERVED.match(field):
+            expression = field
+            if field not in names:
+                names.append(field)
+        else:
+            return None
+        if _UNSAFE_SPEC.search(spec or ""):
+            return None
+        conversion = f"!{conversion}" if conversion else ""
+        spec = f":{spec}" if spec else ""
+        pieces.append("f'{" + expression + conversion + spec + "}'")
+    return " ".join(pieces) or "''", positional, names
+
+
+@lru_cache(maxsize=256)
+def compile_template(template):
+    """
+    Return a function render(*args, **kwargs) giving the same result as
+    template.format(*args, **kwargs). Templates that _parse_template() cannot
+    translate fall back to the bound str.format method.
+    """
+    parsed = _parse_template(template)
+    if parsed is None:
+        return template.format
+    expression, positional, names = parsed
+    parameters = [f"_p{index}" for index in range(positional)] + ["*_extra_args"]
+    parameters += names + ["**_extra_kwargs"]
+    namespace = {}
+    exec(f"def render({', '.join(parameters)}):\n    return {expression}\n", namespace)
+    render = namespace["render"]
+    render.template = template
+    return render
+
+
+@lru_cache(maxsize=256)
+def _rows_function(template, column_count):
+    """
+    Return a function rendering up to n rows from an iterator of row tuples.
+    The f-string is inlined into a list comprehension, so there is no
+    function call per row.
+    """
+    parsed = _parse_template(template)
+    if parsed is None or parsed[2] or parsed[1] > column_count:
+        render = compile_template(template)
+        return lambda rows, n: [render(*row) for row in islice(rows, n)]
+    expression = parsed[0]
+    targets = ", ".join(f"_p{index}" for index in range(column_count)) + ","
+    namespace = {"islice": islice}
+    exec(f"def rows(rows, n):\n    return [{expression} for {targets} in islice(rows, n)]\n", namespace)
+    return namespace["rows"]
+
+
+@lru_cache(maxsize=256)
+def _printf_plan(template):
+    """
+    Split a positional-only template into %-escaped literals and fields.
+    Each field is (column, printf_conversion, spec, conversion), where
+    printf_conversion is None unless the spec has an exact printf equivalent.
+    Returns None for templates with named, attribute or index fields.
+    """
+    literals = []
+    fields = []
+    auto_index = 0
+    pending = ""
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        pending += literal.replace("%", "%%")
+        if field is None:
+            continue
+        if field == "":
+            field = str(auto_index)
+            auto_index += 1
+        if not _INDEX.match(field) or _UNSAFE_SPEC.search(spec):
+            return None
+        printf = None
+        if conversion and not spec:
+            printf = "%" + conversion
+        elif not conversion and not spec:
+            printf = "%s"
+        elif not conversion:
+            match = _PRINTF_SPEC.match(spec)
+            if match is not None and not (match["align"] and match["zero"]):
+                flags = "-" if match["align"] == "<" else ""
+                printf = "%" + flags + "".join(match.group("sign", "alt", "zero", "width", "type"))
+        literals.append(pending)
+        pending = ""
+        fields.append((int(field), printf, spec, conversion))
+    literals.append(pending)
+    return tuple(literals), tuple(fields)
+
+
+@lru_cache(maxsize=256)
+def _column_function(spec, conversion):
+    """Return a function formatting a list of values with one field, as a list of strings."""
+    conversion = f"!{conversion}" if conversion else ""
+    spec = f":{spec}" if spec else ""
+    namespace = {}
+    exec(f"def column(values):\n    return [f'{{value{conversion}{spec}}}' for value in values]\n", namespace)
+    return namespace["column"]
+
+
+@lru_cache(maxsize=8)
+def _repeated_format(row_format, rows, sep):
+    return sep.join([row_format] * rows)
+
+
+def _render_batch(template, batch, rows, sep):
+    """
+    Render `rows` rows from a list of column lists into one string with a
+    single "%" operation. Fields without a printf equivalent - or integer
+    specs over non-int values, where printf would quietly truncate floats
+    that str.format rejects - are pre-rendered column-wise and spliced in
+    through %s.
+    """
+    plan = _printf_plan(template)
+    if plan is None or any(field[0] >= len(batch) for field in plan[1]):
+        return sep.join(_rows_function(template, len(batch))(zip(*batch), rows))
+    literals, fields = plan
+    row_format = [literals[0]]
+    columns = []
+    for (column, printf, spec, conversion), literal in zip(fields, literals[1:]):
+        values = batch[column] if len(batch[column]) == rows else batch[column][:rows]
+        if printf is None or (printf[-1] in "dxXo" and not set(map(type, values)) <= _INT_TYPES):
+            printf = "%s"
+            values = _column_function(spec, conversion)(values)
+        row_format.append(printf)
+        row_format.append(literal)
+        columns.append(values)
+    arguments = tuple(chain.from_iterable(zip(*columns)))
+    return _repeated_format("".join(row_format), rows, sep) % arguments
+
+
+def _as_list(values):
+    # NumPy arrays format much faster as Python ints than as NumPy scalars
+    return values.tolist() if hasattr(values, "tolist") else values
+
+
+def format_rows(template, *columns, sep="\n", out=None, batch_size=65536):
+    """
+    Render template once per row of the given columns (positional fields
+    {0}, {1}, ... index the columns) and stop at the shortest column.
+    Columns are consumed lazily in batches of batch_size rows; each batch is
+    written to out, or the whole result is returned when out is None.
+    """
+    target = io.StringIO() if out is None else out
+    iterators = [iter(_as_list(column)) for column in columns]
+    first = True
+    while iterators:
+        batch = [list(islice(iterator, batch_size)) for iterator in iterators]
+        rows = min(map(len, batch))
+        if rows == 0:
+            break
+        if not first:
+            target.write(sep)
+        target.write(_render_batch(template, batch, rows, sep))
+        first = False
+    if out is None:
+        return target.getvalue()
+
+
+def format_column(values, spec, sep="\n", out=None, batch_size=65536):
+    """
+    Format every value with one spec (or a COLUMN_SPECS name) into a single
+    sep-joined string, or write it to out (a text file or buffer).
+    """
+    spec = COLUMN_SPECS.get(spec, spec)
+    return format_rows("{0:" + spec + "}", values, sep=sep, out=out, batch_size=batch_size)
+
+
+if __name__ == "__main__":
+    import timeit
+
+    num, large_num = 42, 1000000
+    render = compile_template("Swapped: {1:,} comes before {0:05d}")
+    print(render(num, large_num))
+    print(compile_template("Reused: {0} is {0:b} in binary and {0:x} in hex")(num))
+    print(format_column([num, large_num, -7], "hex_prefixed", sep=" "))
+
+    values = list(range(-500_000, 500_000))
+    for template in ("{0:05d} {0:#x} {1:+d}", "{0:05d} {0:#x} {1:,}"):
+        per_value = timeit.timeit(lambda: "\n".join([template.format(v, v) for v in values]), number=1)
+        compiled = timeit.timeit(lambda: format_rows(template, values, values), number=1)
+        print(f"{len(values):,} rows of {template!r}: .format {per_value:.2f}s, "
+              f"format_rows {compiled:.2f}s ({per_value / compiled:.1f}x)")
+    for name in ("hex", "zero_padded", "binary", "thousands"):
+        spec = COLUMN_SPECS[name]
+        per_value = timeit.timeit(lambda: "\n".join(["{0:{1}}".format(v, spec) for v in values]), number=1)
+        column = timeit.timeit(lambda: format_column(values, name), number=1)
+        print(f"{len(values):,} {name} values: .format {per_value:.2f}s, "
+              f"format_column {column:.2f}s ({per_value / column:.1f}x)")
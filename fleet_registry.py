@@ -0,0 +1,254 @@
+"""
+Indexed fleet registry
+
+advanced_inheritance.Car recomputes its age from a hard-coded year and
+rebuilds full_description on every access, and class.py's Cars/Automobile
+keep the same kind of data in separate objects. FleetRegistry holds a whole
+fleet in columns, one row per vehicle:
+
+    fleet = FleetRegistry(reference_date=2026)
+    car = fleet.add("Toyota", 2020, "Camry", "Hybrid", color="black")
+    fleet.find(manufacturer="Toyota", min_age=3, max_age=10)
+    fleet.full_description(car)
+
+Text fields are stored as codes into category tables, and each of
+manufacturer, model, engine type and year has a secondary index mapping a
+value to the sorted rows holding it. find() takes the rows of the most
+selective criterion from its index and checks the remaining criteria against
+the columns of those rows only. Age ranges become year ranges against
+reference_date, which can be a year or a date and can be changed at any time.
+A vehicle registered without a year (class.py's Cars has none) stores the
+NO_YEAR marker: it has no age, is left out of the year index and never
+matches a year or age criterion.
+
+full_description strings are cached per vehicle. update() drops the entry of
+the vehicle it changes, and changing reference_date drops them all, since
+every age moves.
+"""
+
+import datetime
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+TEXT_FIELDS = ("manufacturer", "model", "engine_type", "color")
+INDEXED_FIELDS = ("manufacturer", "model", "engine_type", "year_made")
+NO_YEAR = -2 ** 31          # year_made of a vehicle whose year is unknown
+
+
+class FleetRegistry:
+    def __init__(self, reference_date=None):
+        self.categories = {field: [] for field in TEXT_FIELDS}      # code -> value
+        self._codes = {field: {} for field in TEXT_FIELDS}          # value -> code
+        self.columns = {field: array("I") for field in TEXT_FIELDS}
+        self.columns["year_made"] = array("i")
+        # field -> {code or year -> array of rows}
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        self._years = []            # distinct years, sorted, for age range queries
+        self._descriptions = {}     # row -> cached full_description
+        self.reference_date = reference_date
+
+    @property
+    def reference_date(self):
+        return self._reference_date
+
+    @reference_date.setter
+    def reference_date(self, value):
+        if value is None:
+            value = datetime.date.today()
+        self._reference_date = value
+        self.reference_year = value if isinstance(value, int) else value.year
+        self._descriptions.clear()
+
+    def __len__(self):
+        return len(self.columns["year_made"])
+
+    def _code(self, field, value):
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[field])
+            self.categories[field].append(value)
+        return code
+
+    @staticmethod
+    def _year(value):
+        """year_made as stored in the int32 column: None becomes NO_YEAR, anything else must be an int."""
+        if value is None:
+            return NO_YEAR
+        if type(value) is not int:
+            raise TypeError(f"year_made must be an int or None, not {type(value).__name__}")
+        if not NO_YEAR < value < 2 ** 31:
+            raise ValueError(f"year_made {value} is out of range")
+        return value
+
+    def _index_add(self, field, key, row):
+        if field == "year_made" and key == NO_YEAR:
+            return
+        rows = self.indexes[field].get(key)
+        if rows is None:
+            rows = self.indexes[field][key] = array("I")
+            if field == "year_made":
+                self._years.insert(bisect_left(self._years, key), key)
+        if not rows or rows[-1] < row:
+            rows.append(row)
+        else:
+            insort(rows, row)       # an updated vehicle moving into a group keeps it sorted
+
+    def _index_remove(self, field, key, row):
+        if field == "year_made" and key == NO_YEAR:
+            return
+        rows = self.indexes[field][key]
+        del rows[rows.index(row)]
+        if not rows:
+            del self.indexes[field][key]
+            if field == "year_made":
+                self._years.remove(key)
+
+    def add(self, manufacturer, year_made, model, engine_type, color=None):
+        """Register a vehicle and return its id (its row number); year_made may be None."""
+        row = len(self)
+        year_made = self._year(year_made)
+        values = {"manufacturer": manufacturer, "model": model, "engine_type": engine_type, "color": color}
+        # Everything that can fail happens before the first column is touched
+        codes = {field: self._code(field, value) for field, value in values.items()}
+        for field, code in codes.items():
+            self.columns[field].append(code)
+            if field in self.indexes:
+                self._index_add(field, code, row)
+        self.columns["year_made"].append(year_made)
+        self._index_add("year_made", year_made, row)
+        return row
+
+    def add_vehicle(self, vehicle):
+        """Register an advanced_inheritance.Car or a class.py Cars/Automobile instance."""
+        if hasattr(vehicle, "_year_made"):
+            return self.add(vehicle._manufacturer, vehicle._year_made, getattr(vehicle, "_car_model", None),
+                            getattr(vehicle, "_engine_type", None))
+        return self.add(vehicle.brand, getattr(vehicle, "year_made", None), getattr(vehicle, "model", None),
+                        getattr(vehicle, "engine", None), vehicle.color)
+
+    def get(self, vehicle_id):
+        record = {field: self.categories[field][self.columns[field][vehicle_id]] for field in TEXT_FIELDS}
+        year_made = self.columns["year_made"][vehicle_id]
+        record["year_made"] = None if year_made == NO_YEAR else year_made
+        return record
+
+    def update(self, vehicle_id, **fields):
+        """Change fields of one vehicle, keeping indexes and cached descriptions consistent."""
+        unknown = [field for field in fields if field not in self.columns]
+        if unknown:
+            raise KeyError(f"unknown field {unknown[0]!r}")
+        # Work out every new value first, so a bad one leaves the vehicle and the indexes untouched
+        changes = []
+        for field, value in fields.items():
+            new = self._year(value) if field == "year_made" else self._code(field, value)
+            old = self.columns[field][vehicle_id]
+            if new != old:
+                changes.append((field, old, new))
+        for field, old, new in changes:
+            if field in self.indexes:
+                self._index_remove(field, old, vehicle_id)
+                self._index_add(field, new, vehicle_id)
+            self.columns[field][vehicle_id] = new
+        self._descriptions.pop(vehicle_id, None)
+
+    def age(self, vehicle_id):
+        """Whole years since year_made, or None when the year is unknown."""
+        year_made = self.columns["year_made"][vehicle_id]
+        return None if year_made == NO_YEAR else self.reference_year - year_made
+
+    def full_description(self, vehicle_id):
+        """Same text as advanced_inheritance.Car.full_description, built once until the vehicle changes."""
+        description = self._descriptions.get(vehicle_id)
+        if description is None:
+            record = self.get(vehicle_id)
+            age = self.age(vehicle_id)
+            description = self._descriptions[vehicle_id] = (
+                f"Automobile by: {record['manufacturer']} {record['model']} "
+                f"({record['engine_type']}) - {'age unknown' if age is None else f'{age} years old'}")
+        return description
+
+    def _year_range(self, min_age, max_age):
+        low = self.reference_year - max_age if max_age is not None else NO_YEAR + 1
+        high = self.reference_year - min_age if min_age is not None else 2 ** 31 - 1
+        return low, high
+
+    def find(self, manufacturer=None, model=None, engine_type=None, year_made=None, min_age=None, max_age=None):
+        """
+        Sorted ids of the vehicles matching every given criterion (ages in
+        whole years, inclusive). Rows come from the most selective index;
+        the other criteria are checked against the columns of those rows only.
+        """
+        criteria = []           # (index groups holding the matches, column, low, high)
+        for field, value in (("manufacturer", manufacturer), ("model", model), ("engine_type", engine_type)):
+            if value is not None:
+                code = self._codes[field].get(value, -1)
+                criteria.append(([self.indexes[field].get(code, ())], field, code, code))
+        if year_made is not None:
+            criteria.append(([self.indexes["year_made"].get(year_made, ())], "year_made", year_made, year_made))
+        if min_age is not None or max_age is not None:
+            low, high = self._year_range(min_age, max_age)
+            years = self._years[bisect_left(self._years, low):bisect_right(self._years, high)]
+            criteria.append(([self.indexes["year_made"][year] for year in years], "year_made", low, high))
+        if not criteria:
+            return list(range(len(self)))
+        criteria.sort(key=lambda criterion: sum(map(len, criterion[0])))
+        groups = criteria[0][0]
+        rows = list(groups[0]) if len(groups) == 1 else sorted(row for group in groups for row in group)
+        for _, field, low, high in criteria[1:]:
+            column = self.columns[field]
+            if low == high:
+                rows = [row for row in rows if column[row] == low]
+            else:
+                rows = [row for row in rows if low <= column[row] <= high]
+        return rows
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from advanced_inheritance import Car
+
+    fleet = FleetRegistry(reference_date=datetime.date(2026, 1, 1))
+    camry = fleet.add_vehicle(Car("Toyota", 2020, "Camry", "Hybrid"))
+    print(fleet.full_description(camry), "|", Car("Toyota", 2020, "Camry", "Hybrid").full_description)
+    fleet.update(camry, engine_type="Petrol")
+    fleet.reference_date = 2030
+    print(fleet.full_description(camry))
+
+    rng = random.Random(5)
+    makes = {"Toyota": ["Camry", "Corolla", "RAV4"], "Volvo": ["XC90", "S60"], "Peugeot": ["208", "3008", "508"],
+             "Honda": ["Civic", "Accord"], "Ford": ["Focus", "Ranger", "Mustang"]}
+    engines = ["Hybrid", "Petrol", "Diesel", "Electric", "v8"]
+    cars = []
+    for _ in range(1_000_000):
+        make = rng.choice(list(makes))
+        cars.append(Car(make, rng.randint(1990, 2025), rng.choice(makes[make]), rng.choice(engines)))
+
+    fleet = FleetRegistry(reference_date=2026)
+    started = time.perf_counter()
+    for car in cars:
+        fleet.add_vehicle(car)
+    print(f"registered {len(fleet):,} vehicles in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    scanned = [i for i, car in enumerate(cars)
+               if car._car_model == "Mustang" and car._engine_type == "Electric" and 3 <= car.age <= 5]
+    scan = time.perf_counter() - started
+    started = time.perf_counter()
+    found = fleet.find(model="Mustang", engine_type="Electric", min_age=3, max_age=5)
+    indexed = time.perf_counter() - started
+    assert scanned == found
+    print(f"electric Mustangs aged 3-5: {len(found):,}, object scan {scan:.3f}s, indexes {indexed:.4f}s")
+
+    sample = found[:1000] * 100
+    started = time.perf_counter()
+    for row in sample:
+        cars[row].full_description
+    rebuilt = time.perf_counter() - started
+    started = time.perf_counter()
+    for row in sample:
+        fleet.full_description(row)
+    cached = time.perf_counter() - started
+    print(f"{len(sample):,} descriptions: Car property {rebuilt:.3f}s, registry cache {cached:.3f}s")
@@ -1,7 +1,7 @@
-import urllib.request, BeautifulSoup
-#connect to a site
-r = urllib.request.urlopen("https://goal.com")
-text = r.read()
-#parse into beautifulsoup
-soup = BeautifulSoup.BeautifulSoup(text)
-soup.contents[0].name
\ No newline at end of file
+from fetcher import Fetcher
+from html_stream import extract
+#connect to a site and stream the response in chunks as it arrives
+with Fetcher() as fetcher:
+    #parse incrementally and stop reading at the first element
+    first = next(extract(fetcher.stream("https://goal.com"), "*", with_text=False))
+print(first.tag)
@@ -0,0 +1,190 @@
+"""
+Formatting-strategy benchmark
+
+Runs every integer spec demonstrated in integer_formatting.py through each
+way of producing it:
+
+    fstring  - f"{v:05d}"
+    format   - "{0:05d}".format(v)
+    percent  - "%05d" % v          (only specs printf can express)
+    compiled - fast_format.compile_template("{0:05d}")(v)   (expect no gain over format)
+    bulk     - fast_format.format_column(values, "05d"), cost divided per value
+
+over value sets of different magnitudes and sign mixes, and reports ns/op
+plus traced bytes and allocated blocks per op. Results are written as JSON
+and can be compared against an earlier run:
+
+    python3 format_benchmark.py --output baseline.json
+    python3 format_benchmark.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from fast_format import compile_template, format_column
+
+# spec -> printf equivalent (None where % has no way to express it)
+SPECS = {
+    "d": "%d",
+    "05d": "%05d",
+    "5d": "%5d",
+    "<5d": "%-5d",
+    "^5d": None,
+    "+d": "%+d",
+    " d": "% d",
+    "b": None,
+    "o": "%o",
+    "x": "%x",
+    "X": "%X",
+    "#x": "%#x",
+    ",": None,
+    "_": None,
+}
+
+MAGNITUDES = {"small": (0, 999), "large": (10 ** 9, 10 ** 12), "huge": (10 ** 30, 10 ** 31)}
+SIGNS = ("positive", "negative", "mixed")
+
+
+def make_values(magnitude, sign, count, rng):
+    low, high = MAGNITUDES[magnitude]
+    values = [rng.randint(low, high) for _ in range(count)]
+    if sign == "negative":
+        values = [-value for value in values]
+    elif sign == "mixed":
+        values = [value if rng.random() < 0.5 else -value for value in values]
+    return values
+
+
+def strategies(spec):
+    """Return {style: function(values) -> formatted output} for one spec."""
+    namespace = {}
+    exec(f"def fstring(values):\n    return [f'{{v:{spec}}}' for v in values]\n", namespace)
+    template = "{0:" + spec + "}"
+    render = compile_template(template)
+    found = {
+        "fstring": namespace["fstring"],
+        "format": lambda values: [template.format(v) for v in values],
+        "compiled": lambda values: [render(v) for v in values],
+        "bulk": lambda values: format_column(values, spec),
+    }
+    if SPECS[spec] is not None:
+        printf = SPECS[spec]
+        found["percent"] = lambda values: [printf % v for v in values]
+    return found
+
+
+def measure(func, values, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func(values)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func(values)
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return {
+        "ns_per_op": best / len(values),
+        "bytes_per_op": peak / len(values),
+        "blocks_per_op": blocks / len(values),
+    }
+
+
+def run(count, repeat, seed=1234):
+    rng = random.Random(seed)
+    value_sets = {(magnitude, sign): make_values(magnitude, sign, count, rng)
+                  for magnitude in MAGNITUDES for sign in SIGNS}
+    results = []
+    for spec in SPECS:
+        funcs = strategies(spec)
+        reference = None
+        for (magnitude, sign), values in value_sets.items():
+            for style, func in funcs.items():
+                output = func(values[:50])
+                output = output if isinstance(output, str) else "\n".join(output)
+                reference = output if style == "fstring" else reference
+                if output != reference:
+                    raise AssertionError(f"{style} disagrees with fstring for spec {spec!r}")
+                row = {"spec": spec, "style": style, "magnitude": magnitude, "sign": sign}
+                row.update(measure(func, values, repeat))
+                results.append(row)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "count": count,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def result_key(row):
+    return (row["spec"], row["style"], row["magnitude"], row["sign"])
+
+
+def print_summary(report):
+    """Print mean ns/op per spec and style, averaged over the value sets."""
+    styles = ("fstring", "format", "percent", "compiled", "bulk")
+    totals = {}
+    for row in report["results"]:
+        totals.setdefault((row["spec"], row["style"]), []).append(row["ns_per_op"])
+    print(f"{'spec':>6} " + " ".join(f"{style:>9}" for style in styles) + "   (ns/op)")
+    for spec in SPECS:
+        cells = []
+        for style in styles:
+            samples = totals.get((spec, style))
+            cells.append(f"{sum(samples) / len(samples):9.1f}" if samples else f"{'-':>9}")
+        print(f"{spec!r:>6} " + " ".join(cells))
+
+
+def compare(report, baseline, threshold):
+    """Print rows whose ns/op moved by more than threshold against the baseline."""
+    previous = {result_key(row): row for row in baseline["results"]}
+    regressions = 0
+    for row in report["results"]:
+        old = previous.get(result_key(row))
+        if old is None:
+            continue
+        ratio = row["ns_per_op"] / old["ns_per_op"]
+        if abs(ratio - 1) > threshold:
+            regressions += ratio > 1
+            print(f"{'SLOWER' if ratio > 1 else 'faster'} {ratio:5.2f}x "
+                  f"spec={row['spec']!r} style={row['style']} {row['magnitude']}/{row['sign']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20_000, help="values per set")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs (best is kept)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results from an earlier --output")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change to report")
+    args = parser.parse_args(argv)
+
+    report = run(args.count, args.repeat)
+    print_summary(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Streaming HTML extraction
+
+folder.py downloaded a whole page and built a full BeautifulSoup tree just to
+read the name of its first element. extract() instead feeds the page to an
+incremental html.parser as chunks arrive and yields matching elements as
+soon as they are complete:
+
+    with Fetcher() as fetcher:
+        title = next(extract(fetcher.stream("https://goal.com"), "title"))
+        print(title.text)
+
+Selectors are simple CSS: a tag (or *), #id, .class, [attr] and [attr=value]
+combined without spaces, optionally joined by spaces for "descendant of".
+Each selector yields at most `limit` elements; once every selector has
+reached its limit the parser stops reading, so the rest of the page is never
+downloaded or parsed. Only the stack of open elements and the text of
+elements currently being matched are kept, so peak memory does not grow
+with page size (pass with_text=False when matching elements that span the
+whole page, such as the root).
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+# Elements that never have an end tag
+VOID_ELEMENTS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                           "link", "meta", "param", "source", "track", "wbr"))
+_COMPOUND = re.compile(r"(?P<tag>\*|[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+|\[[^\]]+\])*)\Z")
+_PART = re.compile(r"([.#])([\w-]+)|\[\s*([\w-]+)\s*(?:=\s*[\"']?([^\"'\]]*)[\"']?\s*)?\]")
+
+
+class Element:
+    def __init__(self, selector, tag, attrs):
+        self.selector = selector
+        self.tag = tag
+        self.attrs = attrs
+        self.text = ""
+        self._parts = []
+
+    def __repr__(self):
+        return f"Element({self.tag!r}, {self.attrs!r}, text={self.text[:40]!r})"
+
+
+def _parse_compound(source):
+    """'a.nav#top[href]' -> (tag or None, id or None, set of classes, [(attr, value or None)])"""
+    match = _COMPOUND.match(source)
+    if match is None or not source:
+        raise ValueError(f"unsupported selector {source!r}")
+    tag = match["tag"] if match["tag"] not in (None, "*") else None
+    element_id, classes, attributes = None, set(), []
+    for symbol, name, attribute, value in _PART.findall(match["rest"]):
+        if symbol == "#":
+            element_id = name
+        elif symbol == ".":
+            classes.add(name)
+        else:
+            attributes.append((attribute.lower(), value if value != "" else None))
+    return tag and tag.lower(), element_id, frozenset(classes), attributes
+
+
+def parse_selector(selector):
+    """Split a selector on whitespace into compounds, outermost ancestor first."""
+    return [_parse_compound(part) for part in selector.split()]
+
+
+def _matches(compound, tag, attrs, classes):
+    wanted_tag, element_id, wanted_classes, attributes = compound
+    return ((wanted_tag is None or wanted_tag == tag)
+            and (element_id is None or attrs.get("id") == element_id)
+            and wanted_classes <= classes
+            and all(name in attrs and (value is None or attrs[name] == value) for name, value in attributes))
+
+
+class StreamExtractor(HTMLParser):
+    def __init__(self, selectors, limit=1, with_text=True):
+        super().__init__()
+        self.selectors = [(selector, parse_selector(selector)) for selector in selectors]
+        self.limit = limit
+        self.with_text = with_text
+        self.started = dict.fromkeys(selectors, 0)
+        self.completed = dict.fromkeys(selectors, 0)
+        self.found = []             # finished elements not yet handed out
+        self._stack = []            # open elements: (tag, attrs, classes)
+        self._capturing = []        # (stack depth, Element) for matches still open
+
+    @property
+    def done(self):
+        return self.limit is not None and all(count >= self.limit for count in self.completed.values())
+
+    def _ancestors_match(self, compounds):
+        # Match the remaining compounds against ancestors right to left, nearest first
+        position = len(compounds) - 1
+        for tag, attrs, classes in reversed(self._stack):
+            if position < 0:
+                break
+            if _matches(compounds[position], tag, attrs, classes):
+                position -= 1
+        return position < 0
+
+    def _open(self, tag, attrs, void):
+        attrs = {name: value or "" for name, value in attrs}
+        classes = frozenset(attrs.get("class", "").split())
+        for selector, compounds in self.selectors:
+            if self.limit is not None and self.started[selector] >= self.limit:
+                continue
+            if _matches(compounds[-1], tag, attrs, classes) and self._ancestors_match(compounds[:-1]):
+                self.started[selector] += 1
+                element = Element(selector, tag, attrs)
+                if void or not self.with_text:
+                    self._finish(element)
+                else:
+                    self._capturing.append((len(self._stack), element))
+        if not void:
+            self._stack.append((tag, attrs, classes))
+
+    def _finish(self, element):
+        element.text = "".join(element._parts)
+        element._parts = None
+        self.completed[element.selector] += 1
+        self.found.append(element)
+
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs, tag in VOID_ELEMENTS)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element, which also closes omitted end tags like </p>
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                break
+        else:
+            return
+        del self._stack[depth:]
+        while self._capturing and self._capturing[-1][0] >= depth:
+            self._finish(self._capturing.pop()[1])
+
+    def handle_data(self, data):
+        for _, element in self._capturing:
+            element._parts.append(data)
+
+    def flush(self):
+        """Finish elements left open at the end of the document."""
+        self.close()
+        while self._capturing:
+            self._finish(self._capturing.pop()[1])
+
+
+def extract(chunks, *selectors, limit=1, with_text=True, encoding="utf-8"):
+    """
+    Yield Elements matching the selectors from an iterable of HTML chunks
+    (bytes or str), stopping as soon as each selector found `limit` elements
+    (limit=None reads everything). Elements come out in the order they close.
+    With with_text=False no text is collected and elements are yielded as
+    soon as their start tag is parsed.
+    """
+    parser = StreamExtractor(selectors or ("*",), limit, with_text)
+    decoder = codecs.getincrementaldecoder(encoding)("replace")
+    chunks = iter(chunks)
+    try:
+        for chunk in chunks:
+            parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            yield from _drain(parser)
+            if parser.done:
+                return
+        parser.feed(decoder.decode(b"", final=True))
+        parser.flush()
+        yield from _drain(parser)
+    finally:
+        # Stop a streaming source (e.g. Fetcher.stream) from downloading the rest
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _drain(parser):
+    found, parser.found = parser.found, []
+    return iter(found)
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    from fetcher import Fetcher, serve_test_site
+
+    sample = ['<html><head><title>Goal', ' news</title></head><body><p class="lead">Kick-off',
+              ' <a href="/live">live</a><br></p><p>second</body></html>']
+    print(list(extract(sample, "*", with_text=False)))
+    print(list(extract(sample, "p.lead a[href]", "title", "p", limit=None)))
+
+    for page_size in (200_000, 5_000_000):
+        server, urls = serve_test_site(pages=1, page_size=page_size)
+        with Fetcher(max_workers=1) as fetcher:
+            tracemalloc.start()
+            started = time.perf_counter()
+            parser = HTMLParser()
+            parser.feed(fetcher.fetch(urls[0]).text())
+            parser.close()
+            full = time.perf_counter() - started
+            full_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            title = next(extract(fetcher.stream(urls[0], chunk_size=16384), "title"))
+            streamed = time.perf_counter() - started
+            stream_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        server.shutdown()
+        print(f"{page_size:>9,} byte page: full read+parse {full * 1000:7.1f} ms, peak {full_peak / 1e6:6.2f} MB | "
+              f"streamed {title.text!r} in {streamed * 1000:5.1f} ms, peak {stream_peak / 1e6:5.2f} MB")
@@ -11,6 +11,41 @@ In Python, method encapsulation is achieved through naming conventions:
 3. Private methods: Double underscore prefix (e.g., __method_name) - name mangling applied
 """
 
+import hashlib
+import hmac
+import math
+import multiprocessing
+import numbers
+import os
+import re
+import secrets
+import time
+from functools import partial
+from itertools import chain, islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - the bulk paths fall back to pure Python
+    np = None
+
+from aggregates import HyperLogLog, RunningStats
+from caching import MISSING, LRUCache
+
+# Struct codes of the numeric buffers Calculator.add_many accepts without a per-item check
+_NUMERIC_FORMATS = set("?bBhHiIlLqQnNefd")
+# Exact types add_many accepts without checking items one by one
+_PLAIN_NUMBER_TYPES = {int, float, bool}
+
+
+def _int_array_sum(array):
+    """Exact sum of an integer or bool NumPy array, as a Python int."""
+    if array.size == 0:
+        return 0
+    bound = max(abs(int(array.min())), abs(int(array.max())))
+    if bound * array.size < 2 ** 63:
+        return int(array.sum(dtype=np.int64))       # cannot overflow
+    return sum(array.tolist())
+
 # Example 1: Basic Method Encapsulation
 class Calculator:
     def __init__(self):
@@ -39,38 +74,221 @@ class Calculator:
         else:
             print("Invalid Number")
 
+    # Private method - bulk counterpart of __validate
+    def __validate_many(self, values):
+        """
+        Private method returning (accepted_values, rejected_count, types), where
+        types is the set of Python types the accepted values sum as.
+        NumPy arrays and numeric buffers are accepted wholesale from their
+        dtype or format; other iterables are checked item by item, without a
+        method call per item. Other real numbers (NumPy scalars, Fractions)
+        are accepted as the Python int or float they convert to.
+        """
+        if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+            return values.ravel(), 0, {float if values.dtype.kind == "f" else int}
+        try:
+            view = memoryview(values)
+        except TypeError:
+            view = None
+        if view is not None and view.format in _NUMERIC_FORMATS:
+            types = {float if view.format in "efd" else int}
+            if np is not None:
+                return np.asarray(view).ravel(), 0, types
+            return view.cast("B").cast(view.format).tolist(), 0, types
+        items = list(values)
+        types = set(map(type, items))
+        if types <= _PLAIN_NUMBER_TYPES:
+            return items, 0, types
+        accepted = [num if type(num) in _PLAIN_NUMBER_TYPES else int(num) if isinstance(num, numbers.Integral)
+                    else float(num) for num in items if isinstance(num, numbers.Real)]
+        return accepted, len(items) - len(accepted), set(map(type, accepted))
+
+    # Private method
+    def __neumaier(self, total, compensation, values):
+        """Private method - Neumaier-compensated summation, returns the new (total, compensation)."""
+        for num in values:
+            new_total = total + num
+            if abs(total) >= abs(num):
+                compensation += (total - new_total) + num
+            else:
+                compensation += (num - new_total) + total
+            total = new_total
+        return total, compensation
+
+    # Private method
+    def __start_sum(self):
+        """Private method - the running state [exact int part, float total, float low part, any floats]."""
+        if type(self.result) is float:
+            return [0, self.result, 0.0, True]
+        return [self.result, 0.0, 0.0, False]
+
+    # Private method
+    def __add_to_sum(self, state, accepted, types, method, carry=True):
+        """
+        Private method - ints go into the exact int part, only floats are
+        compensated ("kahan") or summed exactly ("fsum") into total + low.
+        carry=False skips working out the low part fsum leaves behind, which
+        only a later chunk needs.
+        """
+        is_array = np is not None and isinstance(accepted, np.ndarray)
+        if float not in types:
+            state[0] += _int_array_sum(accepted) if is_array else sum(accepted)
+            return
+        if is_array:
+            floats = accepted.tolist()
+        elif types == {float}:
+            floats = accepted
+        else:
+            floats = [num for num in accepted if type(num) is float]
+            state[0] += sum(num for num in accepted if type(num) is not float)
+        state[3] = True
+        if method == "kahan":
+            state[1], state[2] = self.__neumaier(state[1], state[2], floats)
+        else:
+            total = math.fsum(chain(state[1:3], floats))
+            state[2] = math.fsum(chain(state[1:3], floats, (-total,))) if carry else 0.0
+            state[1] = total
+
+    # Private method
+    def __sum_result(self, state):
+        """Private method - the running state as one number; an int while no float was added."""
+        integer, total, low, floats = state
+        if not floats:
+            return integer
+        high = float(integer)
+        return math.fsum((high, float(integer - int(high)), total, low))
+
+    # Public method - bulk interface
+    def add_many(self, values, method="fast"):
+        """
+        Public method adding a whole iterable, NumPy array or numeric buffer.
+        method is "fast" (a single sum - NumPy's pairwise sum for float arrays),
+        "kahan" (Neumaier-compensated) or "fsum" (math.fsum, correctly rounded).
+        Integers are always summed exactly; the compensated methods only apply
+        to the floats. Invalid entries are skipped like in add. Returns the
+        number added.
+        """
+        if method not in ("fast", "kahan", "fsum"):
+            raise ValueError(f"Unknown summation method: {method}")
+        accepted, rejected, types = self.__validate_many(values)
+        if rejected:
+            print(f"Invalid Number ({rejected} skipped)")
+        if method != "fast":
+            state = self.__start_sum()
+            self.__add_to_sum(state, accepted, types, method, carry=False)
+            self.result = self.__sum_result(state)
+        elif np is not None and isinstance(accepted, np.ndarray):
+            if accepted.dtype.kind == "f":
+                self.result += accepted.sum().item()
+            else:
+                self.result += _int_array_sum(accepted)
+        else:
+            self.result += sum(accepted)
+        return len(accepted)
+
+    # Public method - streaming interface
+    def add_stream(self, values, chunk_size=65536, method="fast"):
+        """
+        Public generator mode of add_many: consumes values lazily in chunks and
+        yields the running result after each chunk. For "kahan" and "fsum" the
+        exact int part and the low-order part of the float total are carried
+        between chunks, so the final result agrees with add_many over the
+        whole stream.
+        """
+        if method not in ("fast", "kahan", "fsum"):
+            raise ValueError(f"Unknown summation method: {method}")
+        if np is not None and isinstance(values, np.ndarray):
+            # Slices stay arrays, so each chunk is accepted from its dtype
+            values = values.ravel()
+            chunks = (values[start:start + chunk_size] for start in range(0, len(values), chunk_size))
+        else:
+            iterator = iter(values)
+            chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+        state = self.__start_sum()
+        for chunk in chunks:
+            if method == "fast":
+                self.add_many(chunk)
+                yield self.result
+                continue
+            accepted, rejected, types = self.__validate_many(chunk)
+            if rejected:
+                print(f"Invalid Number ({rejected} skipped)")
+            self.__add_to_sum(state, accepted, types, method)
+            self.result = self.__sum_result(state)
+            yield self.result
+
 # Demonstrating encapsulation
-calc = Calculator()
-calc.add(10)  # Public method - works fine
-calc.add(5)   # Public method - works fine
-print(f"Result: {calc.result}")
+if __name__ == "__main__":
+    calc = Calculator()
+    calc.add(10)  # Public method - works fine
+    calc.add(5)   # Public method - works fine
+    print(f"Result: {calc.result}")
 
-# Attempting to access private method directly - this will fail
-try:
-    calc.__validate(10)  # This will raise AttributeError
-except AttributeError as e:
-    print(f"Error accessing private method: {e}")
+    # Attempting to access private method directly - this will fail
+    try:
+        calc.__validate(10)  # This will raise AttributeError
+    except AttributeError as e:
+        print(f"Error accessing private method: {e}")
 
-# However, you can still access it using name mangling (not recommended)
-print(f"Accessing private method via name mangling: {calc._Calculator__validate(10)}")
+    # However, you can still access it using name mangling (not recommended)
+    print(f"Accessing private method via name mangling: {calc._Calculator__validate(10)}")
 
-print("\n" + "="*60 + "\n")
+    # Bulk and streaming additions - one validation pass per batch
+    calc.add_many([0.1] * 10, method="fsum")
+    print(f"Result after add_many: {calc.result}")
+    for running_total in calc.add_stream(range(1, 101), chunk_size=50):
+        print(f"Running total: {running_total}")
+
+    print("\n" + "="*60 + "\n")
 
 # Example 2: Bank Account with Multiple Encapsulation Types
 class BankAccount:
+    # PBKDF2 work factor - deliberately slow, which is why verified sessions are cached
+    PIN_ITERATIONS = 200_000
+    # Shared by all accounts, keyed by (account_number, session_token)
+    _verified_sessions = LRUCache(max_size=1024, ttl=300)
+
     def __init__(self, account_number, initial_balance=0):
         self.account_number = account_number    # Public attribute
         self._balance = initial_balance         # Protected attribute (convention)
-        self.__pin = None                       # Private attribute
+        self.__pin_salt = None                  # Private attribute
+        self.__pin_hash = None                  # Private attribute - never the raw PIN
         self.__transaction_history = []         # Private attribute
     
+    # Private method - the expensive key derivation
+    def __hash_pin(self, pin, salt):
+        """Private method to derive the salted PBKDF2 hash of a PIN."""
+        return hashlib.pbkdf2_hmac("sha256", str(pin).encode(), salt, self.PIN_ITERATIONS)
+
     # Private method - completely hidden from external access
     def __validate_pin(self, pin):
         """
         Private method to validate PIN.
         This method is hidden to prevent external tampering with security logic.
+        The digests are compared in constant time.
         """
-        return self.__pin == pin
+        if self.__pin_hash is None or pin is None:
+            return False
+        return hmac.compare_digest(self.__hash_pin(pin, self.__pin_salt), self.__pin_hash)
+
+    # Private method - the fast path used once a session is open
+    def __validate_session(self, session):
+        """
+        Private method to validate a session token issued by open_session.
+        Sessions remember the PIN hash they were verified against, so changing
+        the PIN invalidates every open session.
+        """
+        verified_hash = self._verified_sessions.get((self.account_number, session))
+        if verified_hash is None or self.__pin_hash is None:
+            return False
+        return hmac.compare_digest(verified_hash, self.__pin_hash)
+
+    # Private method - accepts either credential
+    def __authorize(self, pin, session):
+        """Private method that checks a session token if given, the PIN otherwise."""
+        if session is not None:
+            return self.__validate_session(session)
+        return self.__validate_pin(pin)
     
     # Private method - internal logging
     def __log_transaction(self, transaction_type, amount):
@@ -97,19 +315,42 @@ class BankAccount:
     def set_pin(self, new_pin):
         """Public method to set PIN - provides controlled access to private data."""
         if len(str(new_pin)) == 4:
-            self.__pin = new_pin
+            self.__pin_salt = os.urandom(16)
+            self.__pin_hash = self.__hash_pin(new_pin, self.__pin_salt)
             return True
         return False
+
+    # Public method - external interface
+    def open_session(self, pin):
+        """
+        Public method that verifies the PIN once and returns a session token.
+        Operations called with session=token skip the key derivation until
+        the token expires or is closed. Returns None for a wrong PIN.
+        """
+        if not self.__validate_pin(pin):
+            return None
+        token = secrets.token_hex(16)
+        self._verified_sessions.set((self.account_number, token), self.__pin_hash)
+        return token
+
+    # Public method - external interface
+    def close_session(self, session):
+        """Public method to forget a session token before it expires."""
+        self._verified_sessions.pop((self.account_number, session))
     
     # Public method - external interface
-    def withdraw(self, amount, pin):
+    def withdraw(self, amount, pin=None, session=None):
         """
         Public method that uses private validation.
         Demonstrates how public methods can use private methods internally.
         """
-        if not self.__validate_pin(pin):
+        if not self.__authorize(pin, session):
             return "Invalid PIN"
-        
+        return self.__debit(amount)
+
+    # Private method - shared by withdraw and apply_batch once authorized
+    def __debit(self, amount):
+        """Private method that moves money out after the caller has been authorized."""
         if amount > self._balance:
             return "Insufficient funds"
         
@@ -127,53 +368,201 @@ class BankAccount:
         return "Invalid amount"
     
     # Public method - controlled access to private data
-    def get_balance(self, pin):
+    def get_balance(self, pin=None, session=None):
         """Public method that provides controlled access to balance."""
-        if self.__validate_pin(pin):
+        if self.__authorize(pin, session):
             return self._balance
         return "Invalid PIN"
 
+    # Public method - bulk interface
+    def apply_batch(self, operations, pin=None, session=None):
+        """
+        Public method for bulk callers such as bank_service.AccountStore.
+        Authorizes once, then applies each (operation, amount) pair in order
+        and returns the list of results the single-call methods would return.
+        """
+        authorized = self.__authorize(pin, session)
+        results = []
+        for operation, amount in operations:
+            if operation == "deposit":
+                results.append(self.deposit(amount))
+            elif not authorized:
+                results.append("Invalid PIN")
+            elif operation == "withdraw":
+                results.append(self.__debit(amount))
+            elif operation == "get_balance":
+                results.append(self._balance)
+            else:
+                results.append(f"Unknown operation: {operation}")
+        return results
+
 # Demonstrating different levels of encapsulation
-account = BankAccount("12345", 1000)
-account.set_pin(1234)
+if __name__ == "__main__":
+    account = BankAccount("12345", 1000)
+    account.set_pin(1234)
 
-# Public methods work fine
-print(account.deposit(500))
-print(account.withdraw(200, 1234))
-print(f"Balance: ${account.get_balance(1234)}")
+    # Public methods work fine
+    print(account.deposit(500))
+    print(account.withdraw(200, 1234))
+    print(f"Balance: ${account.get_balance(1234)}")
 
-# Protected method - accessible but not recommended
-interest = account._calculate_interest(5)
-print(f"Interest calculation: ${interest}")
+    # Verify the PIN once, then reuse the session to skip the slow hash
+    session = account.open_session(1234)
+    print(f"Balance (session): ${account.get_balance(session=session)}")
 
-# Private methods - not directly accessible
-try:
-    account.__validate_pin(1234)  # This will fail
-except AttributeError as e:
-    print(f"Cannot access private method: {e}")
+    # Protected method - accessible but not recommended
+    interest = account._calculate_interest(5)
+    print(f"Interest calculation: ${interest}")
 
-print("\n" + "="*60 + "\n")
+    # Private methods - not directly accessible
+    try:
+        account.__validate_pin(1234)  # This will fail
+    except AttributeError as e:
+        print(f"Cannot access private method: {e}")
+
+    print("\n" + "="*60 + "\n")
 
 # Example 3: Different Types of Method Encapsulation
+
+# Module-level helpers for DataProcessor - kept outside the class so that
+# worker processes can import them
+def _encrypt(data, secret_key):
+    return f"encrypted_{data}_{secret_key}"
+
+
+def _decrypt(encrypted_data, secret_key):
+    return encrypted_data.replace("encrypted_", "").replace(f"_{secret_key}", "")
+
+
+def _process_item(data, secret_key):
+    return f"Processed: {_decrypt(_encrypt(data, secret_key), secret_key)}"
+
+
+# Set once per worker process by the pool initializer, not sent with every task
+_worker_secret_key = None
+
+
+def _init_worker(secret_key):
+    global _worker_secret_key
+    _worker_secret_key = secret_key
+
+
+def _process_chunk(items):
+    secret_key = _worker_secret_key
+    return [_process_item(item, secret_key) for item in items]
+
+
+def _remove_token(chunks, token):
+    """
+    Yield the bytes of a chunk stream with every occurrence of token removed,
+    matching bytes.replace(token, b"") on the joined input. Output pieces are
+    memoryview slices of the input chunks; only the last len(token) - 1 raw
+    bytes are held back between chunks to catch matches split across them.
+    """
+    pattern = re.compile(re.escape(token))
+    keep = len(token) - 1
+    tail = b""
+    for chunk in chunks:
+        view = memoryview(chunk)
+        pos = 0
+        if tail and len(view) < keep:
+            # Too short to settle the held-back bytes; rescan them with this chunk
+            view = memoryview(tail + view.tobytes())
+        elif tail:
+            # A match may start in the held-back bytes and end inside this chunk
+            match = pattern.search(tail + view[:keep].tobytes())
+            if match is not None and match.start() < len(tail):
+                yield tail[:match.start()]
+                pos = match.end() - len(tail)
+            else:
+                yield tail
+        for match in pattern.finditer(view, pos):
+            if match.start() > pos:
+                yield view[pos:match.start()]
+            pos = match.end()
+        cut = max(pos, len(view) - keep)
+        if cut > pos:
+            yield view[pos:cut]
+        tail = view[cut:].tobytes()
+    if tail:
+        yield tail
+
+
 class DataProcessor:
-    def __init__(self):
+    def __init__(self, cache_size=256, cache_ttl=None):
         self.data = []
-        self._cache = {}           # Protected - for internal use
+        self._cache = LRUCache(max_size=cache_size, ttl=cache_ttl)  # Protected - for internal use
         self.__secret_key = "xyz"  # Private - completely hidden
+        self.last_run_stats = None  # Public - throughput of the last process_many call
+        self._aggregates = {}       # Protected - name -> aggregate fed by add_data
     
     # Public method
     def add_data(self, item):
         """Public method - part of the class interface."""
         self.data.append(item)
-        self._invalidate_cache()  # Calling protected method
+        for aggregate in self._aggregates.values():
+            aggregate.update(item)
+        # Only results that read up to the end of the data can see the new item
+        self._invalidate_cache(len(self.data) - 1, len(self.data))  # Calling protected method
+
+    # Public method
+    def query(self, name, func, start=0, stop=None):
+        """
+        Public method returning func(self.data[start:stop]), memoized under name.
+        The result is remembered together with the range it read, so appends
+        only evict it when that range is open-ended (stop=None).
+        """
+        key = (name, start, stop)
+        result = self._cache.get(key, MISSING)
+        if result is MISSING:
+            result = func(self.data[start:stop])
+            self._cache.set(key, result, depends_on=self._dependency_range(start, stop))
+        return result
+
+    # Public method
+    def register_aggregate(self, name, aggregate):
+        """
+        Public method subscribing an incremental aggregate (see aggregates.py).
+        Existing data is folded in once; afterwards each add_data costs O(1)
+        per aggregate instead of a rescan.
+        """
+        for item in self.data:
+            aggregate.update(item)
+        self._aggregates[name] = aggregate
+        return aggregate
+
+    # Public method
+    def get_aggregate(self, name):
+        """Public method returning a registered aggregate's current state."""
+        return self._aggregates[name]
+
+    # Public method
+    def cache_stats(self):
+        """Public method exposing the cache hit/miss/eviction counters."""
+        return self._cache.stats()
     
     # Protected method (single underscore)
-    def _invalidate_cache(self):
+    def _invalidate_cache(self, start=None, stop=None):
         """
         Protected method - convention suggests internal use.
         Still accessible from outside but indicates it's not part of public API.
+        With no arguments the whole cache is cleared; otherwise only results
+        depending on data[start:stop] are dropped.
+        """
+        if start is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate_range(start, stop)
+
+    # Protected method
+    def _dependency_range(self, start, stop):
+        """
+        Protected method mapping slice bounds to the absolute range they cover.
+        Negative bounds move as data grows, so they count as reading to the end.
         """
-        self._cache.clear()
+        if start is None or start < 0 or (stop is not None and stop < 0):
+            return (0, None)
+        return (start, stop)
     
     # Protected method
     def _get_cached_result(self, key):
@@ -186,12 +575,12 @@ class DataProcessor:
         Private method - name mangling applied.
         Completely hidden from external access through normal means.
         """
-        return f"encrypted_{data}_{self.__secret_key}"
+        return _encrypt(data, self.__secret_key)
     
     # Private method
     def __decrypt_data(self, encrypted_data):
         """Private method for decryption."""
-        return encrypted_data.replace(f"encrypted_", "").replace(f"_{self.__secret_key}", "")
+        return _decrypt(encrypted_data, self.__secret_key)
     
     # Public method using private methods
     def process_secure_data(self, data):
@@ -204,27 +593,128 @@ class DataProcessor:
         decrypted = self.__decrypt_data(encrypted)
         return f"Processed: {decrypted}"
 
+    # Public method - bulk interface
+    def process_many(self, items, processes=None, target_chunk_seconds=0.05):
+        """
+        Public method returning process_secure_data(item) for every item, in order.
+        Items are spread over a process pool whose workers receive the secret
+        key once, at start-up. Chunk sizes adapt to the measured cost per item
+        so each task takes about target_chunk_seconds. Throughput is recorded
+        in self.last_run_stats.
+        """
+        items = list(items)
+        processes = processes or os.cpu_count() or 1
+        started = time.perf_counter()
+        chunk_size = self._chunk_size(items, processes, target_chunk_seconds)
+        chunks = (items[i:i + chunk_size] for i in range(0, len(items), chunk_size))
+        results = []
+        with multiprocessing.Pool(processes, initializer=_init_worker,
+                                  initargs=(self.__secret_key,)) as pool:
+            for chunk_result in pool.imap(_process_chunk, chunks):
+                results.extend(chunk_result)
+        elapsed = time.perf_counter() - started
+        self.last_run_stats = {
+            'items': len(items),
+            'processes': processes,
+            'chunk_size': chunk_size,
+            'seconds': elapsed,
+            'items_per_second': len(items) / elapsed if elapsed else 0.0,
+        }
+        return results
+
+    # Public method - bulk interface
+    def process_all(self):
+        """Public method running process_many over everything added with add_data."""
+        return self.process_many(self.data)
+
+    # Protected method
+    def _chunk_size(self, items, processes, target_chunk_seconds):
+        """
+        Protected method sizing process_many tasks from a timed local probe.
+        Chunks are capped so every worker still gets several of them.
+        """
+        if not items:
+            return 1
+        probe = items[:256]
+        started = time.perf_counter()
+        for item in probe:
+            _process_item(item, self.__secret_key)
+        per_item = max((time.perf_counter() - started) / len(probe), 1e-9)
+        upper = max(1, -(-len(items) // (processes * 4)))
+        return max(1, min(int(target_chunk_seconds / per_item), upper))
+
+    # Private method - streaming counterpart of __encrypt_data
+    def __encrypt_stream(self, chunks):
+        """Private generator wrapping a chunk stream the way __encrypt_data wraps a string."""
+        yield b"encrypted_"
+        yield from chunks
+        yield f"_{self.__secret_key}".encode()
+
+    # Private method - streaming counterpart of __decrypt_data
+    def __decrypt_stream(self, chunks):
+        """Private generator applying both __decrypt_data replacements chunk by chunk."""
+        without_prefix = _remove_token(chunks, b"encrypted_")
+        return _remove_token(without_prefix, f"_{self.__secret_key}".encode())
+
+    # Public method using private methods
+    def process_secure_stream(self, source, chunk_size=64 * 1024):
+        """
+        Public streaming variant of process_secure_data for large payloads.
+        source is a binary file object or an iterable of bytes chunks; yields
+        bytes-like output chunks whose concatenation equals the UTF-8 encoding
+        of process_secure_data on the whole input. Memory use depends on the
+        chunk size, not on the payload size.
+        """
+        if hasattr(source, "read"):
+            source = iter(partial(source.read, chunk_size), b"")
+        yield b"Processed: "
+        yield from self.__decrypt_stream(self.__encrypt_stream(source))
+
 # Demonstrating the different access levels
-processor = DataProcessor()
+if __name__ == "__main__":
+    processor = DataProcessor()
 
-# Public method - works
-processor.add_data("test")
-print(f"Data: {processor.data}")
+    # Public method - works
+    processor.add_data("test")
+    print(f"Data: {processor.data}")
 
-# Protected method - accessible but not recommended
-processor._invalidate_cache()  # Works but violates convention
+    # Memoized queries - an append only evicts results that read to the end
+    processor.query("first_item", lambda items: items[0], 0, 1)
+    processor.query("item_count", len)
+    processor.add_data("more")
+    processor.query("first_item", lambda items: items[0], 0, 1)  # still cached
+    print(f"Item count: {processor.query('item_count', len)}")  # recomputed
+    print(f"Cache stats: {processor.cache_stats()}")
 
-# Private method - not accessible
-try:
-    processor.__encrypt_data("secret")  # This will fail
-except AttributeError as e:
-    print(f"Private method not accessible: {e}")
+    # Protected method - accessible but not recommended
+    processor._invalidate_cache()  # Works but violates convention
+
+    # Private method - not accessible
+    try:
+        processor.__encrypt_data("secret")  # This will fail
+    except AttributeError as e:
+        print(f"Private method not accessible: {e}")
+
+    # Public method using private methods - works
+    result = processor.process_secure_data("confidential")
+    print(result)
+
+    # Incremental aggregates - kept up to date by add_data, no rescans
+    processor.register_aggregate("lengths", RunningStats(key=len))
+    processor.register_aggregate("distinct", HyperLogLog())
+    processor.add_data("test")
+    print(processor.get_aggregate("lengths"))
+    print(f"Distinct items: ~{processor.get_aggregate('distinct').count()}")
+
+    # Bulk variant - the whole list on a process pool, order preserved
+    print(processor.process_all())
+    print(f"Run stats: {processor.last_run_stats}")
 
-# Public method using private methods - works
-result = processor.process_secure_data("confidential")
-print(result)
+    # Streaming variant - same output, produced chunk by chunk
+    chunks = [b"confi", b"dential"]
+    print(b"".join(processor.process_secure_stream(chunks)).decode())
 
-print("\n" + "="*60 + "\n")
+    print("\n" + "="*60 + "\n")
 
 """
 Summary of Method Encapsulation Types in Python:
@@ -0,0 +1,267 @@
+"""
+People directory
+
+Person is defined in text.py (firstname, lastname, country), adv.inherit.py
+(firstname, lastname, hobby, community, plus Student) and fmt.py. Finding
+people by a name prefix or by community means scanning every object, and
+each bio()/introduction() call concatenates its string again.
+PeopleDirectory indexes any of those objects, or its own PersonRecord:
+
+    people = PeopleDirectory()
+    people.add_many([PersonRecord("Prospa", "Anyanwu", community="Owerri-North"), ...])
+    people.complete("pro", k=5)         # top 5 matches for the prefix, in name order
+    people.in_community("owerri-north")
+    people.bio(person_id)
+
+- lowercased first name, last name and "first last" are keys of a
+  compressed (radix) trie: a chain of single-child nodes is one edge, so a
+  prefix lookup costs the length of the prefix, not the number of people
+- community and country have hash indexes
+- add_many() groups the batch by key and inserts the distinct keys in
+  sorted order, so shared prefixes are walked once per key, not per person
+- bios are rendered on first request and cached until update()
+"""
+
+from os.path import commonprefix
+
+
+class PersonRecord:
+    __slots__ = ("firstname", "lastname", "community", "country", "hobby")
+
+    def __init__(self, firstname, lastname, community=None, country=None, hobby=None):
+        self.firstname = firstname
+        self.lastname = lastname
+        self.community = community
+        self.country = country
+        self.hobby = hobby
+
+    def __repr__(self):
+        return f"PersonRecord({self.firstname!r}, {self.lastname!r})"
+
+
+class _Node:
+    __slots__ = ("edges", "ids")
+
+    def __init__(self):
+        self.edges = {}         # first character -> (label, child node)
+        self.ids = []           # people whose key ends exactly here
+
+
+class RadixTrie:
+    def __init__(self):
+        self.root = _Node()
+
+    def insert(self, key, ids):
+        node = self.root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.edges[key[0]] = (key, child)
+                node = child
+                break
+            label, child = edge
+            if key.startswith(label):
+                node = child
+                key = key[len(label):]
+                continue
+            common = len(commonprefix((label, key)))
+            if common < len(label):
+                # Split the edge: label[:common] leads to a new node holding the old remainder
+                middle = _Node()
+                middle.edges[label[common]] = (label[common:], child)
+                node.edges[key[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            key = key[common:]
+        node.ids.extend(ids)
+
+    def remove(self, key, person_id):
+        node = self.root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None or not key.startswith(edge[0]):
+                return
+            key = key[len(edge[0]):]
+            node = edge[1]
+        if person_id in node.ids:
+            node.ids.remove(person_id)
+
+    def _find(self, prefix):
+        """The node whose subtree holds every key starting with prefix, or None."""
+        node = self.root
+        while prefix:
+            edge = node.edges.get(prefix[0])
+            if edge is None:
+                return None
+            label, child = edge
+            if prefix.startswith(label):
+                prefix = prefix[len(label):]
+            elif label.startswith(prefix):
+                prefix = ""
+            else:
+                return None
+            node = child
+        return node
+
+    def iter_ids(self, prefix):
+        """Ids under prefix, ordered by key (lexicographically), then by insertion."""
+        node = self._find(prefix)
+        if node is None:
+            return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield from node.ids
+            stack.extend(child for _, (_, child) in sorted(node.edges.items(), reverse=True))
+
+
+class PeopleDirectory:
+    HASHED_FIELDS = ("community", "country")
+
+    def __init__(self, renderer=None):
+        self.people = []                # id -> person object
+        self.names = RadixTrie()
+        self.indexes = {field: {} for field in self.HASHED_FIELDS}     # field -> lowercased value -> ids
+        self.renderer = renderer or self.render_bio
+        self._bios = {}                 # id -> cached bio
+
+    def __len__(self):
+        return len(self.people)
+
+    def __getitem__(self, person_id):
+        return self.people[person_id]
+
+    @staticmethod
+    def _keys(person):
+        first, last = person.firstname.lower(), person.lastname.lower()
+        return {first, last, f"{first} {last}"}
+
+    def _index(self, person, person_id):
+        for field in self.HASHED_FIELDS:
+            value = getattr(person, field, None)
+            if value is not None:
+                self.indexes[field].setdefault(value.lower(), []).append(person_id)
+
+    def add(self, firstname, lastname, **fields):
+        return self.add_person(PersonRecord(firstname, lastname, **fields))
+
+    def add_person(self, person):
+        """Index a person object (anything with firstname and lastname) and return its id."""
+        return self.add_many([person])[0]
+
+    def add_many(self, people):
+        """Index a batch of person objects; returns their ids."""
+        start = len(self.people)
+        self.people.extend(people)
+        by_key = {}
+        for person_id in range(start, len(self.people)):
+            person = self.people[person_id]
+            for key in self._keys(person):
+                by_key.setdefault(key, []).append(person_id)
+            self._index(person, person_id)
+        for key in sorted(by_key):
+            self.names.insert(key, by_key[key])
+        return list(range(start, len(self.people)))
+
+    def update(self, person_id, **fields):
+        """Change attributes of a person, re-indexing it and dropping its cached bio."""
+        person = self.people[person_id]
+        for key in self._keys(person):
+            self.names.remove(key, person_id)
+        for field in self.HASHED_FIELDS:
+            value = getattr(person, field, None)
+            if value is not None:
+                self.indexes[field][value.lower()].remove(person_id)
+        for field, value in fields.items():
+            setattr(person, field, value)
+        for key in self._keys(person):
+            self.names.insert(key, [person_id])
+        self._index(person, person_id)
+        self._bios.pop(person_id, None)
+
+    def complete(self, prefix, k=10):
+        """
+        Up to k (person_id, person) pairs whose first name, last name or full
+        name starts with prefix (case-insensitive), in lexicographic key order.
+        """
+        seen = set()
+        results = []
+        for person_id in self.names.iter_ids(prefix.lower()):
+            if person_id not in seen:
+                seen.add(person_id)
+                results.append((person_id, self.people[person_id]))
+                if len(results) == k:
+                    break
+        return results
+
+    def count_prefix(self, prefix):
+        return len(set(self.names.iter_ids(prefix.lower())))
+
+    def in_community(self, community):
+        return list(self.indexes["community"].get(community.lower(), ()))
+
+    def in_country(self, country):
+        return list(self.indexes["country"].get(country.lower(), ()))
+
+    @staticmethod
+    def render_bio(person):
+        parts = [f"My name is {person.firstname} {person.lastname}"]
+        for field, text in (("community", "from {}"), ("country", "from {}"), ("hobby", "my favourite activity is {}")):
+            value = getattr(person, field, None)
+            if value:
+                parts.append(text.format(value))
+        return ", ".join(parts)
+
+    def bio(self, person_id):
+        bio = self._bios.get(person_id)
+        if bio is None:
+            bio = self._bios[person_id] = self.renderer(self.people[person_id])
+        return bio
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    people = PeopleDirectory()
+    people.add_many([PersonRecord("Prospa", "Anyanwu", community="Owerri-North", hobby="dancing"),
+                     PersonRecord("Nnena", "Anyanwu", community="Imo-state", hobby="football"),
+                     PersonRecord("prospa", "smith", country="Nigeria")])
+    print(people.complete("pro"), people.complete("nnena a"))
+    print(people.in_community("owerri-north"), people.bio(0))
+
+    rng = random.Random(11)
+    syllables = ["pro", "spa", "nne", "na", "chi", "ka", "emeka", "ada", "obi", "ora", "uche", "ngo", "zi", "tun", "de"]
+    communities = [f"Community-{number}" for number in range(200)]
+
+    def name():
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+
+    records = [PersonRecord(name(), name(), community=rng.choice(communities), hobby="football")
+               for _ in range(300_000)]
+    people = PeopleDirectory()
+    started = time.perf_counter()
+    people.add_many(records)
+    print(f"indexed {len(people):,} people in {time.perf_counter() - started:.2f}s")
+
+    prefixes = [name().lower()[:rng.randint(3, 7)] for _ in range(50)]
+    started = time.perf_counter()
+    for prefix in prefixes:
+        [p for p in records if p.firstname.lower().startswith(prefix) or p.lastname.lower().startswith(prefix)
+         or f"{p.firstname} {p.lastname}".lower().startswith(prefix)]
+    scan = time.perf_counter() - started
+    started = time.perf_counter()
+    for prefix in prefixes:
+        people.complete(prefix, k=10)
+    trie = time.perf_counter() - started
+    print(f"{len(prefixes)} prefix lookups: scan {scan:.2f}s, trie top-10 {trie * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    for _ in range(20):
+        [p for p in records if p.community == "Community-7"]
+    scan = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(20):
+        people.in_community("community-7")
+    print(f"20 community lookups: scan {scan:.2f}s, hash index {(time.perf_counter() - started) * 1000:.2f} ms")
@@ -0,0 +1,39 @@
+"""
+PIN verification benchmark
+
+Compares the latency of get_balance() when every call re-derives the
+PBKDF2 hash of the PIN against calls made with a cached session token.
+
+Usage: python3 pin_benchmark.py [pin_calls] [session_calls]
+"""
+
+import sys
+import time
+
+from method_encapsulation import BankAccount
+
+
+def time_calls(func, calls):
+    """Return the mean latency of func() in microseconds."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(pin_calls=20, session_calls=100_000):
+    account = BankAccount("bench-001", 1000)
+    account.set_pin(1234)
+    session = account.open_session(1234)
+
+    pin_us = time_calls(lambda: account.get_balance(1234), pin_calls)
+    session_us = time_calls(lambda: account.get_balance(session=session), session_calls)
+
+    print(f"PBKDF2 iterations:     {BankAccount.PIN_ITERATIONS:,}")
+    print(f"PIN path (KDF):        {pin_us:12.1f} us/op over {pin_calls:,} calls")
+    print(f"Session path (cached): {session_us:12.3f} us/op over {session_calls:,} calls")
+    print(f"Speed-up:              {pin_us / session_us:12.0f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,146 @@
+"""
+Streaming tabular report writer
+
+string_formatting.py and integer_formatting.py print reports by looping
+over parallel lists with an index:
+
+    for i in range(0, 5):
+        print(string.format(letters[i], float(number[i]), message=msgs[i]))
+
+which fails as soon as the lists are shorter than the range. ReportWriter
+takes the same row template and the columns themselves (any iterables,
+consumed lazily), renders rows in bounded batches through
+fast_format.format_rows and writes them to a large buffered sink. Columns of
+different lengths follow a policy instead of raising IndexError:
+
+    "error"    - raise ValueError once the shortest column runs out early
+    "truncate" - stop at the shortest column, like zip()
+    "pad"      - run to the longest column, filling gaps with `fill`
+
+With "pad" every fill value is formatted by its fields once, up front, so a
+numeric spec such as {1:.2f} left with the default "" fill raises ValueError
+when the writer is created instead of part way through a report.
+"""
+
+import string
+import sys
+from itertools import islice, zip_longest
+
+from fast_format import format_rows
+
+RAGGED_POLICIES = ("error", "truncate", "pad")
+_END = object()
+
+
+def _positional_template(template, names):
+    """Rewrite named fields as positional ones numbered after the positional columns."""
+    pieces = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if field in names:
+            field = str(names[field])
+        pieces.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "".join(pieces)
+
+
+class ReportWriter:
+    def __init__(self, template, sink=None, ragged="error", fill="", batch_size=8192,
+                 buffer_size=1 << 20, encoding="utf-8"):
+        if ragged not in RAGGED_POLICIES:
+            raise ValueError(f"ragged must be one of {RAGGED_POLICIES}")
+        self.template = template
+        self.ragged = ragged
+        self.fill = fill            # a value, or a dict of column index/name -> value
+        self.batch_size = batch_size
+        self.rows_written = 0
+        if ragged == "pad":
+            self._check_fills()
+        self._owns_sink = isinstance(sink, (str, bytes)) or hasattr(sink, "__fspath__")
+        if self._owns_sink:
+            self._sink = open(sink, "w", buffering=buffer_size, encoding=encoding)
+        else:
+            self._sink = sys.stdout if sink is None else sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._owns_sink:
+            self._sink.close()
+        else:
+            self._sink.flush()
+
+    def _fill_for(self, key):
+        if isinstance(self.fill, dict):
+            return self.fill.get(key, "")
+        return self.fill
+
+    def _check_fills(self):
+        """Raise ValueError if a field's spec cannot format the fill that pads its column."""
+        formatter = string.Formatter()
+        auto_index = 0
+        for _, field, spec, conversion in formatter.parse(self.template):
+            if field is None:
+                continue
+            if field == "":
+                field = str(auto_index)
+                auto_index += 1
+            if "{" in spec or "." in field or "[" in field:
+                continue            # nested specs and attribute/index access depend on the row
+            key = int(field) if field.isdigit() else field
+            fill = self._fill_for(key)
+            try:
+                format(formatter.convert_field(fill, conversion), spec)
+            except (TypeError, ValueError) as error:
+                raise ValueError(f"fill {fill!r} cannot be formatted by field {{{field}:{spec}}} ({error}); "
+                                 f"pass an explicit fill for column {key!r}") from None
+
+    def _rows(self, columns, keys):
+        """Yield row tuples according to the ragged policy."""
+        if self.ragged == "truncate":
+            yield from zip(*columns)
+            return
+        fills = [self._fill_for(key) for key in keys]
+        for index, row in enumerate(zip_longest(*columns, fillvalue=_END)):
+            if _END in row:
+                if self.ragged == "error":
+                    short = [key for key, value in zip(keys, row) if value is _END]
+                    raise ValueError(f"columns {short} ended after {self.rows_written + index} rows")
+                row = tuple(fill if value is _END else value for value, fill in zip(row, fills))
+            yield row
+
+    def write_rows(self, *columns, **named_columns):
+        """
+        Render one row per position across the columns. Positional columns
+        feed {0}, {1}, ...; keyword columns feed the matching named fields.
+        Returns the number of rows written by this call.
+        """
+        names = {name: len(columns) + offset for offset, name in enumerate(named_columns)}
+        template = _positional_template(self.template, names)
+        keys = list(range(len(columns))) + list(named_columns)
+        rows = self._rows(list(columns) + list(named_columns.values()), keys)
+        written = 0
+        while batch := list(islice(rows, self.batch_size)):
+            format_rows(template, *zip(*batch), out=self._sink, batch_size=self.batch_size)
+            self._sink.write("\n")
+            written += len(batch)
+            self.rows_written += len(batch)
+        return written
+
+
+if __name__ == "__main__":
+    msgs = ['[sooso...]', '[ok...]', '[terrible..]']
+    number = ['1', '2', '3', '4']
+    letters = ['v', 'w', 'x', 'y', 'z']
+    template = "value *{0!s: ^3}* equals {1:0>+4.3}\t{message!s::<20}"
+
+    with ReportWriter(template, ragged="pad", fill={1: 0.0, "message": "[missing]"}) as report:
+        report.write_rows(letters, map(float, number), message=msgs)
+
+    with ReportWriter(template, ragged="truncate") as report:
+        report.write_rows(letters, map(float, number), message=msgs)
@@ -0,0 +1,172 @@
+"""
+Roster persistence
+
+tes.py used to rebuild its whole list of names on every input and finish with
+one write of a list repr to a hard-coded path. RosterStore keeps members in a
+dict used as an ordered set (O(1) add and membership, duplicates ignored) and
+persists them as JSON lines, one record per member:
+
+    {"name": "ada", "location": "abuja"}
+
+New members are buffered and handed to a background writer thread in groups
+of flush_every, so collecting input never waits on the disk. RosterReader
+reads such a file back incrementally: each poll() returns only the records
+appended since the previous one, and never a half-written line.
+
+If the file cannot be opened or written, nothing is dropped silently: the
+names that did not reach the disk are kept in `unwritten`, and every later
+flush() or close() raises OSError.
+"""
+
+import json
+import os
+import queue
+import threading
+
+_STOP = object()
+
+
+class RosterStore:
+    def __init__(self, path, flush_every=64, load=True, **fields):
+        self.path = os.fspath(path)
+        self.flush_every = flush_every
+        self.fields = fields            # extra values stored with every member, e.g. location
+        self._members = {}              # insertion-ordered set of names
+        self._pending = []
+        self._error = None
+        self.unwritten = []             # names the writer thread failed to store
+        self._queue = queue.Queue()
+        if load and os.path.exists(self.path):
+            for record in RosterReader(self.path).poll():
+                self._members[record["name"]] = None
+        self._writer = threading.Thread(target=self._write_loop, name="roster-writer", daemon=True)
+        self._writer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self):
+        return iter(self._members)
+
+    @property
+    def names(self):
+        return list(self._members)
+
+    def add(self, name):
+        """Add a member; returns False if the name was already on the roster."""
+        if name in self._members:
+            return False
+        self._members[name] = None
+        self._pending.append(name)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+        return True
+
+    def flush(self, wait=False):
+        """Hand the buffered members to the writer thread; optionally wait until they are on disk."""
+        self._raise_writer_error()
+        if self._pending:
+            if not self._writer.is_alive():
+                raise ValueError(f"roster {self.path!r} is closed; {len(self._pending)} names not written")
+            names, self._pending = self._pending, []
+            self._queue.put((names, "".join(json.dumps({"name": name, **self.fields}) + "\n" for name in names)))
+        if wait:
+            self._queue.join()
+            self._raise_writer_error()
+
+    def close(self):
+        """Flush what is left and stop the writer thread."""
+        if self._writer.is_alive():
+            try:
+                self.flush()
+            finally:
+                self._queue.put(_STOP)
+                self._writer.join()
+        self.flush()            # raises if the writer failed or if names were added after close
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            self.unwritten.extend(self._pending)
+            self._pending = []
+            raise OSError(f"writing roster to {self.path!r} failed; "
+                          f"{len(self.unwritten)} names are in .unwritten") from self._error
+
+    def _write_loop(self):
+        # The thread keeps taking groups even when the file is unusable, so flush(wait=True)
+        # and close() never wait on a queue nobody reads; failed groups go to self.unwritten.
+        try:
+            f = open(self.path, "a", encoding="utf-8", buffering=1 << 16)
+        except Exception as error:
+            f = None
+            self._error = error
+        try:
+            while True:
+                # Groups that queued up while the previous write ran go out in a single write
+                groups = [self._queue.get()]
+                while True:
+                    try:
+                        groups.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                received = len(groups)
+                stop = _STOP in groups
+                groups = [group for group in groups if group is not _STOP]
+                if groups and f is not None and self._error is None:
+                    try:
+                        f.write("".join(lines for _, lines in groups))
+                        f.flush()
+                        groups = []
+                    except Exception as error:
+                        self._error = error
+                for names, _ in groups:
+                    self.unwritten.extend(names)
+                for _ in range(received):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            if f is not None:
+                f.close()
+
+
+class RosterReader:
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.offset = 0                 # byte offset just past the last complete line read
+
+    def poll(self):
+        """Yield the records appended since the last poll, stopping before any partial line."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                if line.strip():
+                    yield json.loads(line)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    path = os.path.join(tempfile.mkdtemp(), "roster.jsonl")
+    reader = RosterReader(path)
+    started = time.perf_counter()
+    with RosterStore(path, flush_every=1000, location="abuja") as roster:
+        for number in range(100_000):
+            roster.add(f"player{number % 60_000}")
+    print(f"{len(roster):,} unique names stored in {time.perf_counter() - started:.2f}s")
+    print(f"read back {sum(1 for _ in reader.poll()):,} records; "
+          f"nothing new on the next poll: {list(reader.poll()) == []}")
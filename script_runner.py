@@ -0,0 +1,200 @@
+"""
+Script runner for tests
+
+testcase.py checks helloworld.py like this:
+
+    sys.stdout = captured_output
+    exec(open('helloworld.py').read())
+    sys.stdout = sys.__stdout__
+
+Every test reads and compiles the source again, and while it runs, all output
+of the process goes into the test's buffer. Two such tests cannot run at the
+same time, and a failing script leaves sys.stdout swapped.
+
+run_script() does the same job without either problem:
+
+    result = run_script("helloworld.py")
+    result.stdout           # "HELLO WORLD\\n"
+
+- scripts are compiled once into code objects kept in a CodeCache. An entry
+  is reused while the file's mtime and size are unchanged. Otherwise the
+  bytes are hashed, and only new content is compiled again (touching a file
+  costs a hash, not a compile)
+- each execution gets its own globals, with print (and input, fed from the
+  stdin argument) bound to that execution's buffers, so sys.stdout is never
+  touched. Output written directly to sys.stdout is not captured
+- run_scripts() runs independent scripts across a multiprocessing pool; every
+  worker keeps its own code cache for all the scripts it is given
+
+A script that raises returns a ScriptResult with the formatted traceback in
+`error` instead of raising in the caller; SystemExit(0) or SystemExit(None)
+counts as success.
+"""
+
+import builtins
+import hashlib
+import io
+import os
+import time
+import traceback
+from multiprocessing import Pool
+
+
+class ScriptResult:
+    __slots__ = ("path", "stdout", "error", "elapsed")
+
+    def __init__(self, path, stdout, error=None, elapsed=0.0):
+        self.path = path
+        self.stdout = stdout
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        status = "ok" if self.ok else "failed"
+        return f"<ScriptResult {self.path!r} {status} in {self.elapsed * 1000:.1f} ms>"
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class CodeCache:
+    def __init__(self):
+        self._entries = {}          # absolute path -> (mtime_ns, size, digest, code)
+        self.compiles = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path):
+        """The code object for the script at path, compiling it only when its content changed."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.hits += 1
+            return entry[3]
+        with open(path, "rb") as file:
+            source = file.read()
+        digest = hashlib.sha256(source).digest()
+        if entry is not None and entry[2] == digest:
+            self.hits += 1
+            code = entry[3]
+        else:
+            self.compiles += 1
+            code = compile(source, path, "exec", dont_inherit=True)
+        self._entries[path] = (stat.st_mtime_ns, stat.st_size, digest, code)
+        return code
+
+    def clear(self):
+        self._entries.clear()
+        self.compiles = self.hits = 0
+
+
+_cache = CodeCache()        # per process, so a pool worker reuses it across jobs
+
+
+def _context(path, stdout, stdin):
+    def captured_print(*args, sep=" ", end="\n", file=None, flush=False):
+        builtins.print(*args, sep=sep, end=end, file=stdout if file is None else file, flush=flush)
+
+    def captured_input(prompt=""):
+        stdout.write(str(prompt))
+        line = stdin.readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        return line.rstrip("\n")
+
+    return {"__name__": "__main__", "__file__": path, "__builtins__": builtins,
+            "print": captured_print, "input": captured_input}
+
+
+def run_script(path, stdin="", cache=None):
+    """Execute a script as __main__ and return its ScriptResult; stdin feeds input() calls."""
+    cache = _cache if cache is None else cache
+    stdout = io.StringIO()
+    error = None
+    started = time.perf_counter()
+    try:
+        code = cache.get(path)
+        exec(code, _context(os.path.abspath(path), stdout, io.StringIO(stdin)))
+    except SystemExit as exit:
+        if exit.code not in (None, 0):
+            error = f"SystemExit: {exit.code}"
+    except BaseException as exception:
+        if isinstance(exception, KeyboardInterrupt):
+            raise
+        error = "".join(traceback.format_exception(exception))
+    return ScriptResult(path, stdout.getvalue(), error, time.perf_counter() - started)
+
+
+def _run_job(job):
+    path, stdin = job
+    return run_script(path, stdin)
+
+
+def run_scripts(scripts, processes=None, chunksize=None):
+    """
+    Run scripts (paths, or (path, stdin) pairs) and return their results in
+    order. With processes=1 they run one after another in this process.
+    """
+    jobs = [(script, "") if isinstance(script, str) else tuple(script) for script in scripts]
+    jobs = [(os.path.abspath(path), stdin) for path, stdin in jobs]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) < 2:
+        return list(map(_run_job, jobs))
+    processes = min(processes, len(jobs))
+    if chunksize is None:
+        # Several jobs per message, but enough chunks that slow scripts still spread out
+        chunksize = max(1, len(jobs) // (processes * 4))
+    with Pool(processes) as pool:
+        return pool.map(_run_job, jobs, chunksize)
+
+
+def _exec_with_swapped_stdout(path):
+    """The testcase.py approach: re-read, re-compile and redirect sys.stdout for the run."""
+    import sys
+
+    captured_output = io.StringIO()
+    sys.stdout = captured_output
+    try:
+        exec(open(path).read(), {"__name__": "__main__"})
+    finally:
+        sys.stdout = sys.__stdout__
+    return captured_output.getvalue()
+
+
+if __name__ == "__main__":
+    # python3 script_runner.py [repeats] [processes]
+    import sys
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    scripts = [os.path.join(directory, name) for name in (
+        "helloworld.py", "data_types.py", "text.py", "func.py", "inherit.py", "adv.inherit.py",
+        "args.py", "class.py", "filex.py", "test_function.py", "advanced_inheritance.py", "except1.py")]
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    suite = scripts * repeats
+
+    print(run_script(os.path.join(directory, "helloworld.py")))
+    started = time.perf_counter()
+    expected = [_exec_with_swapped_stdout(path) for path in suite]
+    current = time.perf_counter() - started
+
+    _cache.clear()
+    started = time.perf_counter()
+    results = run_scripts(suite, processes=1)
+    cached = time.perf_counter() - started
+    assert [result.stdout for result in results] == expected, "captured output differs"
+
+    started = time.perf_counter()
+    pooled = run_scripts(suite, processes=max(2, processes))
+    parallel = time.perf_counter() - started
+    assert [result.stdout for result in pooled] == expected
+
+    print(f"{len(suite)} script runs ({len(scripts)} scripts x {repeats}), {os.cpu_count()} CPU(s):")
+    print(f"  exec(open().read()) + sys.stdout swap  {current:.2f}s")
+    print(f"  cached code, per-run print             {cached:.2f}s ({_cache.compiles} compiles, "
+          f"{_cache.hits} cache hits)")
+    print(f"  cached code, pool of {max(2, processes)} processes       {parallel:.2f}s")
@@ -1,24 +1,22 @@
-from pathlib import Path
-
-
-#CONSTANTS
-file_path = Path("/mnt/c/Users/USER-PC/py-basics/learning-python/tes.txt")
-new_team  = []
-team = {
-   'name': [],
-   'location': 'abuja'
-}
-
-player_name = []
-max_player = 2
-
-#loop through the dictonary key "name"
-while  player_name != max_player:
-   player_name = input('enter name here: \n')
-   team['name'].append(player_name)
-   for names in team['name']:
-      new_team.append(names)
-   print(new_team)
-   
-with file_path.open('a') as f:
-   f.write(f"a new list of names in a new file: {new_team}")
+import sys
+from pathlib import Path
+
+from roster import RosterStore
+
+
+#CONSTANTS
+file_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).with_name("tes.jsonl")
+max_player = 2
+
+# the roster keeps names unique and writes them to file_path in the background
+with RosterStore(file_path, location='abuja') as team:
+   added = 0
+   while added < max_player:
+      player_name = input('enter name here: \n')
+      if team.add(player_name):
+         added += 1
+      else:
+         print(f"{player_name} is already on the team")
+      print(team.names)
+
+print(f"a new list of names in {file_path}: {team.names}")
@@ -1,25 +1,353 @@
-import unittest # unittesting
-import sys # import sys()
-from io import StringIO #
-
-class TestHelloWorld(unittest.TestCase):
-    def testExample(self):
-        """Test that helloworld.py prints 'HELLO WORLD'"""
-        # Capture stdout
-        captured_output = StringIO()
-        sys.stdout = captured_output
-        
-        # Execute the helloworld.py code
-        # python3 -c "exec(open('helloworld.py').read())"
-        exec(open('helloworld.py').read())
-        
-        # Reset stdout
-        sys.stdout = sys.__stdout__
-        
-        # Check the output
-        self.assertEqual(captured_output.getvalue().strip(), "HELLO WORLD")
-
-
-if __name__ == '__main__':
-    unittest.main()
-
+import unittest # unittesting
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+from array import array
+from fractions import Fraction
+
+from bank_service import AccountStore, BankService
+from caching import LRUCache
+from creature_store import CreatureStore
+from fast_format import compile_template
+from fleet_registry import FleetRegistry
+from method_encapsulation import Calculator, DataProcessor, _remove_token
+from record_paths import compile_path, flatten, format_key
+from report_writer import ReportWriter
+from script_runner import CodeCache, run_script, run_scripts
+
+class TestHelloWorld(unittest.TestCase):
+    def testExample(self):
+        """Test that helloworld.py prints 'HELLO WORLD'"""
+        # Output is captured per run, sys.stdout is left alone
+        # python3 -c "exec(open('helloworld.py').read())"
+        result = run_script('helloworld.py')
+
+        # Check the output
+        self.assertIsNone(result.error)
+        self.assertEqual(result.stdout.strip(), "HELLO WORLD")
+
+
+class TestScriptRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'script.py')
+        self.write('print("first")\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, source, mtime_ns=None):
+        with open(self.path, 'w') as file:
+            file.write(source)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def testCompiledOnceUntilContentChanges(self):
+        """Unchanged or merely touched scripts reuse their code object"""
+        cache = CodeCache()
+        code = cache.get(self.path)
+        self.assertIs(cache.get(self.path), code)
+        self.write('print("first")\n', mtime_ns=10 ** 18)
+        self.assertIs(cache.get(self.path), code)
+        self.write('print("second")\n')
+        self.assertEqual(run_script(self.path, cache=cache).stdout, "second\n")
+        self.assertEqual(cache.compiles, 2)
+
+    def testErrorsAndInputStayInTheResult(self):
+        """input() reads the given stdin and a failing script returns its traceback"""
+        self.write('name = input("name? ")\nprint("hi", name)\nraise ValueError(name)\n')
+        result = run_script(self.path, stdin="prospa\n", cache=CodeCache())
+        self.assertEqual(result.stdout, "name? hi prospa\n")
+        self.assertIn("ValueError: prospa", result.error)
+
+    def testParallelRunsKeepOutputApart(self):
+        """Scripts run across processes return their own output, in order"""
+        results = run_scripts(['helloworld.py', (self.path, ""), 'helloworld.py'], processes=2)
+        self.assertEqual([result.stdout for result in results], ["HELLO WORLD\n", "first\n", "HELLO WORLD\n"])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    def testEvictsLeastRecentlyUsed(self):
+        """A full cache evicts the entry used longest ago and counts it"""
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual(cache.stats(), {'hits': 3, 'misses': 1, 'evictions': 1, 'invalidations': 0, 'size': 2})
+
+    def testEntriesExpireAfterTtl(self):
+        """An entry is served until its ttl runs out, then it is a miss"""
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set('session', 'token')
+        clock.now = 9.9
+        self.assertEqual(cache.get('session'), 'token')
+        clock.now = 10.0
+        self.assertIsNone(cache.get('session'))
+        self.assertEqual(len(cache), 0)
+        cache.set('session', 'renewed')
+        clock.now = 19.9
+        self.assertEqual(cache.get('session'), 'renewed')
+
+    def testInvalidateRangeDropsOnlyOverlaps(self):
+        """Only entries whose dependency range overlaps the change are dropped"""
+        cache = LRUCache()
+        cache.set('head', 1, depends_on=(0, 3))
+        cache.set('tail', 2, depends_on=(3, None))
+        cache.set('later', 3, depends_on=(5, 8))
+        cache.set('plain', 4)
+        self.assertEqual(cache.invalidate_range(3, 4), 1)
+        self.assertEqual([key for key in ('head', 'tail', 'later', 'plain') if key in cache], ['head', 'later', 'plain'])
+        self.assertEqual(cache.invalidate_range(7), 1)
+        self.assertEqual(cache.stats()['invalidations'], 2)
+
+
+class TestDataProcessorQuery(unittest.TestCase):
+    def setUp(self):
+        self.processor = DataProcessor()
+        for item in ('a', 'b', 'c'):
+            self.processor.add_data(item)
+        self.calls = []
+
+    def query(self, name, start=0, stop=None):
+        def func(items):
+            self.calls.append(name)
+            return list(items)
+        return self.processor.query(name, func, start, stop)
+
+    def testAppendEvictsOnlyOpenEndedRanges(self):
+        """An append keeps results over a closed range, even one ending at the append"""
+        self.query('closed', 0, 3)
+        self.query('open')
+        self.query('beyond', 5)
+        self.processor.add_data('d')
+        self.assertEqual(self.query('closed', 0, 3), ['a', 'b', 'c'])
+        self.assertEqual(self.query('open'), ['a', 'b', 'c', 'd'])
+        self.assertEqual(self.query('beyond', 5), [])
+        self.assertEqual(self.calls, ['closed', 'open', 'beyond', 'open'])
+
+    def testStopPastTheEndSeesAppends(self):
+        """A stop beyond the data still reads the items appended below it"""
+        self.assertEqual(self.query('window', 1, 10), ['b', 'c'])
+        self.processor.add_data('d')
+        self.assertEqual(self.query('window', 1, 10), ['b', 'c', 'd'])
+        self.assertEqual(self.calls, ['window', 'window'])
+
+    def testNegativeBoundsCountAsReadingToTheEnd(self):
+        """Negative bounds move as data grows, so every append evicts them"""
+        self.assertEqual(self.query('last two', -2), ['b', 'c'])
+        self.assertEqual(self.query('all but last', 0, -1), ['a', 'b'])
+        self.processor.add_data('d')
+        self.assertEqual(self.query('last two', -2), ['c', 'd'])
+        self.assertEqual(self.query('all but last', 0, -1), ['a', 'b', 'c'])
+        self.assertEqual(len(self.calls), 4)
+
+
+class TestCalculatorSums(unittest.TestCase):
+    def total(self, values, method, chunk_size=None):
+        calc = Calculator()
+        if chunk_size is None:
+            calc.add_many(values, method)
+        else:
+            for _ in calc.add_stream(values, chunk_size=chunk_size, method=method):
+                pass
+        return calc.result
+
+    def testIntegersStayExact(self):
+        """Every method sums ints exactly, in one call or chunk by chunk"""
+        values = [5 * 10 ** 17, 5, 10 ** 400, -10 ** 400]
+        for method in ("fast", "kahan", "fsum"):
+            self.assertEqual(self.total(values, method), 500000000000000005, method)
+            self.assertEqual(self.total(values, method, chunk_size=3), 500000000000000005, method)
+            self.assertEqual(self.total(array('q', [2 ** 62, 2 ** 62, 1]), method), 2 ** 63 + 1, method)
+
+    def testOnlyFloatsAreCompensated(self):
+        """kahan and fsum keep the int part exact and the float part compensated"""
+        values = [10 ** 17 + 1, 0.5, 1e16, -10 ** 17, -1e16, Fraction(1, 4)]
+        for method in ("kahan", "fsum"):
+            self.assertEqual(self.total(values, method), 1.75, method)
+            self.assertEqual(self.total(values, method, chunk_size=2), 1.75, method)
+        self.assertEqual(self.total([0.1] * 10, "fsum"), 1.0)
+
+
+class TestRecordPaths(unittest.TestCase):
+    def testFlattenedPathsReadTheirValues(self):
+        """Every path flatten() produces compiles back to a reader of the same value"""
+        record = {"items": {"model": "nokia", "it's": 1, 'say "hi"': 2, "a]b": [3, {"": 4}]}, 1: ["x", "y"],
+                  "2": {"x.y": 5}, "back\\slash": 6, " [ ": 7}
+        flat = flatten(record)
+        self.assertEqual(len(flat), 10)
+        for path, value in flat.items():
+            self.assertEqual(compile_path(path)(record), value, path)
+
+    def testKeysNeedingEscapesAreRejected(self):
+        """A key whose quoted form would need escapes is refused, not misnamed"""
+        with self.assertRaises(ValueError):
+            format_key("it's \"quoted\"")
+        with self.assertRaises(ValueError):
+            flatten({"ok": 1, "tab\t.": 2})
+        with self.assertRaises(TypeError):
+            format_key(True)
+
+
+class TestReportWriter(unittest.TestCase):
+    def testPadNeedsFillsTheSpecsCanFormat(self):
+        """A numeric field left with the default "" fill is refused when the writer is made"""
+        with self.assertRaises(ValueError):
+            ReportWriter("{0:.2f} {name}", io.StringIO(), ragged="pad")
+        ReportWriter("{0:.2f} {name}", io.StringIO(), ragged="truncate")
+        out = io.StringIO()
+        report = ReportWriter("{0:.2f}|{name:>3}", out, ragged="pad", fill={0: 0.0})
+        self.assertEqual(report.write_rows([1.5], name=["a", "b"]), 2)
+        self.assertEqual(out.getvalue(), "1.50|  a\n0.00|  b\n")
+
+
+class TestRemoveToken(unittest.TestCase):
+    def check(self, chunks, token):
+        removed = b"".join(bytes(piece) for piece in _remove_token(chunks, token))
+        self.assertEqual(removed, b"".join(chunks).replace(token, b""), (chunks, token))
+
+    def testBoundaries(self):
+        """Tokens split across chunks, short chunks and overlapping matches"""
+        token = b"_xyz"
+        self.check([b"ab_x", b"yzcd"], token)
+        self.check([b"_", b"x", b"y", b"z", b"end"], token)
+        self.check([b"a_xy", b"", b"z_xyz"], token)
+        self.check([b"_xyz_xyz"], token)
+        self.check([b"_xy", b"_xyz"], token)
+        self.check([b"aaa", b"a"], b"aa")
+        self.check([], token)
+
+    def testRandomSplits(self):
+        """Any way of cutting the input gives bytes.replace's result"""
+        rng = random.Random(29)
+        for _ in range(2000):
+            token = bytes(rng.choice(b"ab_") for _ in range(rng.randint(1, 4)))
+            data = bytes(rng.choice(b"ab_") for _ in range(rng.randint(0, 30)))
+            cuts = sorted(rng.randint(0, len(data)) for _ in range(rng.randint(0, 6)))
+            self.check([data[i:j] for i, j in zip([0] + cuts, cuts + [len(data)])], token)
+
+    def testStreamMatchesProcessSecureData(self):
+        """process_secure_stream produces process_secure_data's output chunk by chunk"""
+        processor = DataProcessor()
+        for text in ("confidential", "_xyz", "encrypted_x_xyz"):
+            streamed = b"".join(processor.process_secure_stream([text[:3].encode(), text[3:].encode()]))
+            self.assertEqual(streamed.decode(), processor.process_secure_data(text))
+
+
+class TestCompileTemplate(unittest.TestCase):
+    def testNamesThatCannotBeParameters(self):
+        """Keyword and reserved field names render like str.format instead of failing to compile"""
+        for template, args, kwargs in (("{class}", (), {"class": 1}), ("{0} {_p0}", (1,), {"_p0": 2}),
+                                       ("{_extra_kwargs:>3}", (), {"_extra_kwargs": 4}),
+                                       ("{00:x} {name}", (255,), {"name": "n"})):
+            self.assertEqual(compile_template(template)(*args, **kwargs), template.format(*args, **kwargs))
+
+
+class TestFleetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.fleet = FleetRegistry(reference_date=2026)
+        self.camry = self.fleet.add("Toyota", 2020, "Camry", "Hybrid")
+
+    def assertConsistent(self):
+        fleet = self.fleet
+        self.assertEqual([len(column) for column in fleet.columns.values()], [len(fleet)] * len(fleet.columns))
+        for vehicle_id in range(len(fleet)):
+            record = fleet.get(vehicle_id)
+            self.assertIn(vehicle_id, fleet.find(manufacturer=record["manufacturer"], year_made=record["year_made"]))
+
+    def testRejectedAddLeavesNoPartialRow(self):
+        """A bad year is refused before any column grows"""
+        for year in ("2020", 2.5, True, 2 ** 31, -2 ** 31):
+            with self.assertRaises((TypeError, ValueError)):
+                self.fleet.add("Ford", year, "Focus", "Petrol")
+        self.assertEqual(len(self.fleet), 1)
+        self.assertEqual(self.fleet.add("Ford", None, "Focus", "Petrol"), 1)
+        self.assertEqual(self.fleet.find(manufacturer="Ford"), [1])
+        self.assertConsistent()
+
+    def testRejectedUpdateChangesNothing(self):
+        """A bad value anywhere in update() leaves the vehicle and its indexes as they were"""
+        with self.assertRaises(TypeError):
+            self.fleet.update(self.camry, engine_type="Petrol", year_made="2021")
+        with self.assertRaises(KeyError):
+            self.fleet.update(self.camry, engine_type="Petrol", colour="red")
+        self.assertEqual(self.fleet.get(self.camry)["engine_type"], "Hybrid")
+        self.assertEqual(self.fleet.find(year_made=2020), [self.camry])
+        self.assertEqual(self.fleet.find(engine_type="Petrol"), [])
+        self.fleet.update(self.camry, engine_type="Petrol", year_made=2021)
+        self.assertEqual(self.fleet.find(engine_type="Petrol", year_made=2021), [self.camry])
+        self.assertEqual(self.fleet.age(self.camry), 5)
+        self.assertConsistent()
+
+
+class TestBankService(unittest.TestCase):
+    def setUp(self):
+        self.store = AccountStore()
+        self.store.open_account("12345", 1000, pin=1234)
+
+    def testMalformedRequestsAreAnsweredAlone(self):
+        """Bad accounts, sessions and amounts get an error while the rest of the batch applies"""
+        requests = [{"id": 1, "op": "deposit", "account": "12345", "amount": 50},
+                    {"id": 2, "op": "deposit", "account": ["12345"], "amount": 50},
+                    {"id": 3, "op": "deposit", "account": "12345", "amount": 10 ** 400},
+                    {"id": 4, "op": "deposit", "account": "12345", "amount": float("nan")},
+                    {"id": 5, "op": "get_balance", "account": "12345", "session": ["token"]},
+                    {"id": 6, "op": "deposit", "account": "12345", "amount": 25}]
+
+        async def exchange():
+            service = BankService(self.store, batch_window=0.05)
+            server = await service.start()
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.write_eof()
+            await reader.read()         # the server closes its end once it has read everything
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return service, {response["id"]: response["result"] for response in responses}
+
+        service, results = asyncio.run(exchange())
+        self.assertEqual(results[1], "Deposited: $50")
+        self.assertEqual(results[2], "Invalid account")
+        self.assertEqual(results[3], f"Deposited: ${10 ** 400}")
+        self.assertEqual(results[4], "Invalid amount")
+        self.assertEqual(results[5], "Invalid session")
+        self.assertEqual(results[6], "Deposited: $25")
+        self.assertEqual((service.batches, service.requests), (1, 3))
+        self.assertEqual(self.store.apply_batch([requests[1], requests[0]]), ["Invalid account", "Deposited: $50"])
+
+
+class TestCreatureStore(unittest.TestCase):
+    def testRejectedAddLeavesNoPartialRow(self):
+        """Malformed flyable or swimmable data is refused before any column grows"""
+        store = CreatureStore()
+        store.add("D1", "pond", "mallard", flyable=(500, 80), swimmable=(2, 3), kind="Duck")
+        for flyable, swimmable in (((500,), None), ((500, 80, 1), None), (None, ("deep", 3)), (None, 7)):
+            with self.assertRaises((TypeError, ValueError)):
+                store.add("D2", "pond", "teal", flyable=flyable, swimmable=swimmable, kind="Duck")
+        self.assertEqual(len(store), 1)
+        self.assertNotIn("D2", store)
+        self.assertEqual({len(column) for column in store.columns.values()}, {1})
+        store.add("D2", "lake", "teal", flyable=("700", 60))
+        self.assertEqual(store["D2"].flight_ceiling, 700)
+        self.assertEqual(len(store.can_fly_above(600)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
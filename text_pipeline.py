@@ -0,0 +1,162 @@
+"""
+Streaming text pipeline over memory-mapped files
+
+str.py shows split, rsplit, strip, partition, title, center, ljust, zfill and
+friends on a single in-memory string. TextPipeline chains the same str
+methods as generator stages and runs them over a file line by line:
+
+    pipeline = TextPipeline().strip().title().center(40, "#")
+    pipeline.run("names.txt", "names_out.txt", processes=4)
+
+The input is memory-mapped and lines are yielded lazily, output goes through
+a large write buffer in batches, so memory stays bounded whatever the file
+size. Stages that return several parts (split, rsplit, partition) turn a
+line into a list; later stages apply to every part, and the parts are joined
+with `joiner` when written. With processes > 1 the file is cut into ranges
+on line boundaries, each range is transformed by its own process into a part
+file, and the parts are concatenated in order.
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+from itertools import islice
+from multiprocessing import Pool
+
+# str methods a pipeline may chain, and whether they return several parts
+_STAGES = {
+    "split": True, "rsplit": True, "partition": True, "rpartition": True,
+    "strip": False, "lstrip": False, "rstrip": False,
+    "title": False, "capitalize": False, "lower": False, "upper": False, "swapcase": False,
+    "center": False, "ljust": False, "rjust": False, "zfill": False, "expandtabs": False,
+    "replace": False,
+}
+
+
+def iter_lines(path, start=0, stop=None, encoding="utf-8"):
+    """Lazily yield the lines of a file (without line endings) from a memory map."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            stop = len(mm) if stop is None else stop
+            position = start
+            while position < stop:
+                newline = mm.find(b"\n", position, stop)
+                line_end = stop if newline == -1 else newline
+                line = mm[position:line_end]
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                yield line.decode(encoding)
+                position = line_end + 1
+
+
+def line_boundaries(path, parts):
+    """Cut a file into about `parts` byte ranges that each start at a line start."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    cuts = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for part in range(1, parts):
+            target = max(size * part // parts, cuts[-1])
+            newline = mm.find(b"\n", target)
+            if newline == -1 or newline + 1 >= size:
+                break
+            if newline + 1 > cuts[-1]:
+                cuts.append(newline + 1)
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+class TextPipeline:
+    def __init__(self, encoding="utf-8", joiner="\t", batch_lines=8192, buffer_size=1 << 20):
+        self.encoding = encoding
+        self.joiner = joiner            # joins the parts of split/partition results on output
+        self.batch_lines = batch_lines
+        self.buffer_size = buffer_size
+        self.stages = []                # (str method name, args) in order
+
+    def __getattr__(self, name):
+        # Builder methods: pipeline.strip(), pipeline.center(40, "#"), ...
+        if name not in _STAGES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        def add_stage(*args):
+            self.stages.append((name, args))
+            return self
+        return add_stage
+
+    def apply(self, lines):
+        """Chain every stage over an iterable of lines as lazy generators."""
+        for name, args in self.stages:
+            lines = _stage(lines, name, args)
+        return lines
+
+    def _format(self, value):
+        return value if isinstance(value, str) else self.joiner.join(value)
+
+    def transform_range(self, path, output, start=0, stop=None):
+        """Transform the lines in bytes [start, stop) of path and write them to output."""
+        results = map(self._format, self.apply(iter_lines(path, start, stop, self.encoding)))
+        with open(output, "w", encoding=self.encoding, buffering=self.buffer_size) as out:
+            while batch := list(islice(results, self.batch_lines)):
+                out.write("\n".join(batch))
+                out.write("\n")
+
+    def run(self, path, output, processes=1):
+        """Transform a whole file, optionally splitting the work across processes."""
+        ranges = line_boundaries(path, processes) if processes > 1 else []
+        if len(ranges) < 2:
+            self.transform_range(path, output)
+            return
+        part_dir = tempfile.mkdtemp(prefix="text_pipeline_", dir=os.path.dirname(os.path.abspath(output)))
+        try:
+            parts = [os.path.join(part_dir, f"part{index:05d}") for index in range(len(ranges))]
+            jobs = [(self, path, part, start, stop) for part, (start, stop) in zip(parts, ranges)]
+            with Pool(min(processes, len(jobs))) as pool:
+                pool.starmap(_transform_part, jobs)
+            with open(output, "wb") as out:
+                for part in parts:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out, self.buffer_size)
+        finally:
+            shutil.rmtree(part_dir, ignore_errors=True)
+
+
+def _stage(values, name, args):
+    """One generator stage: apply a str method to each line, or to each part of a split line."""
+    method = getattr(str, name)
+    if _STAGES[name]:
+        for value in values:
+            if isinstance(value, str):
+                yield method(value, *args)
+            else:
+                yield [piece for part in value for piece in method(part, *args)]
+    else:
+        for value in values:
+            if isinstance(value, str):
+                yield method(value, *args)
+            else:
+                yield [method(part, *args) for part in value]
+
+
+def _transform_part(pipeline, path, output, start, stop):
+    pipeline.transform_range(path, output, start, stop)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    sent = "  happy holidays to you and your family  "
+    pipeline = TextPipeline().strip().title().center(48, "#")
+    print(list(pipeline.apply([sent, sent.upper()])))
+    print(list(TextPipeline().strip().rsplit(" ", 2).zfill(8).apply([sent])))
+
+    # python3 text_pipeline.py input.txt output.txt [processes]
+    if len(sys.argv) >= 3:
+        started = time.perf_counter()
+        TextPipeline().strip().title().run(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 1)
+        print(f"Transformed {os.path.getsize(sys.argv[1]):,} bytes in {time.perf_counter() - started:.2f}s")
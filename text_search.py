@@ -0,0 +1,231 @@
+"""
+Multi-pattern substring search
+
+str.py demonstrates find, rfind, index, rindex and count one substring at a
+time. Searching for thousands of patterns that way rescans the text once per
+pattern. This module offers two indexes with the same method names and the
+same start/end semantics as the str methods:
+
+AhoCorasick - built from a set of patterns, finds all of them in a single
+              pass over any text. find/rfind/count return a dict keyed by
+              pattern.
+SuffixArray - built once over a fixed corpus, answers arbitrary substring
+              queries by binary search instead of scanning.
+
+    >>> ac = AhoCorasick(["hol", "you"])
+    >>> ac.find("  happy holidays to you", 5)
+    {'hol': 8, 'you': 20}
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+
+def _bounds(length, start, end):
+    """Normalize str-style start/end arguments (None, negatives) to a range."""
+    start, end, _ = slice(start, end).indices(length)
+    return start, max(start, end)
+
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(patterns))
+        if not all(self.patterns) or not self.patterns:
+            raise ValueError("patterns must be a non-empty collection of non-empty strings")
+        self._delta, self._outputs = self._build(self.patterns)
+        self._reversed = None       # automaton over reversed patterns, built for rfind
+
+    @staticmethod
+    def _build(patterns):
+        """
+        Build the automaton as a deterministic table: delta[node] maps a
+        character to the next node, with failure links already folded in, so
+        scanning costs one dict lookup per character. Transitions back to the
+        root are left out and default to 0.
+        """
+        goto = [{}]
+        outputs = [()]
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                child = goto[node].get(ch)
+                if child is None:
+                    child = len(goto)
+                    goto[node][ch] = child
+                    goto.append({})
+                    outputs.append(())
+                node = child
+            outputs[node] += (pattern_id,)
+
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            # A node's transitions are its failure node's, overridden by its own children
+            table = dict(delta[fail[node]])
+            for ch, child in goto[node].items():
+                fail[child] = delta[fail[node]].get(ch, 0) if node else 0
+                outputs[child] += outputs[fail[child]]
+                table[ch] = child
+                queue.append(child)
+            delta[node] = table
+        return delta, outputs
+
+    def iter_matches(self, text, start=None, end=None):
+        """Yield (index, pattern) for every occurrence, overlapping ones included, ordered by end."""
+        start, end = _bounds(len(text), start, end)
+        delta, outputs, patterns = self._delta, self._outputs, self.patterns
+        node = 0
+        for offset, ch in enumerate(text[start:end], start + 1):
+            node = delta[node].get(ch, 0)
+            for pattern_id in outputs[node]:
+                pattern = patterns[pattern_id]
+                yield offset - len(pattern), pattern
+
+    def find(self, text, start=None, end=None):
+        """Lowest index of each pattern within text[start:end], or -1 - like str.find."""
+        found = dict.fromkeys(self.patterns, -1)
+        remaining = len(found)
+        for index, pattern in self.iter_matches(text, start, end):
+            if found[pattern] == -1:
+                found[pattern] = index
+                remaining -= 1
+                if not remaining:
+                    break
+        return found
+
+    def rfind(self, text, start=None, end=None):
+        """Highest index of each pattern within text[start:end], or -1 - like str.rfind."""
+        if self._reversed is None:
+            self._reversed = AhoCorasick([pattern[::-1] for pattern in self.patterns])
+        start, end = _bounds(len(text), start, end)
+        found = dict.fromkeys(self.patterns, -1)
+        remaining = len(found)
+        # Scanning the reversed text from its start meets the last occurrences first
+        for index, reversed_pattern in self._reversed.iter_matches(text[start:end][::-1]):
+            pattern = reversed_pattern[::-1]
+            if found[pattern] == -1:
+                found[pattern] = end - index - len(pattern)
+                remaining -= 1
+                if not remaining:
+                    break
+        return found
+
+    def count(self, text, start=None, end=None):
+        """Non-overlapping occurrences of each pattern in text[start:end] - like str.count."""
+        counts = dict.fromkeys(self.patterns, 0)
+        next_free = dict.fromkeys(self.patterns, 0)
+        for index, pattern in self.iter_matches(text, start, end):
+            if index >= next_free[pattern]:
+                counts[pattern] += 1
+                next_free[pattern] = index + len(pattern)
+        return counts
+
+
+class SuffixArray:
+    def __init__(self, text):
+        self.text = text
+        self.suffixes = self._build(text)
+
+    @staticmethod
+    def _build(text):
+        """
+        Sort suffix start positions by prefix doubling: each round orders them by
+        the ranks of their first 2k characters, stopping as soon as all ranks differ.
+        """
+        n = len(text)
+        if n == 0:
+            return []
+        rank = [ord(ch) for ch in text]
+        order = sorted(range(n), key=rank.__getitem__)
+        k = 1
+        while True:
+            width = max(rank) + 2
+            keys = [rank[i] * width + (rank[i + k] + 1 if i + k < n else 0) for i in range(n)]
+            order.sort(key=keys.__getitem__)
+            new_rank = [0] * n
+            for position in range(1, n):
+                new_rank[order[position]] = new_rank[order[position - 1]] + (
+                    keys[order[position]] != keys[order[position - 1]])
+            rank = new_rank
+            if rank[order[-1]] == n - 1:
+                return order
+            k *= 2
+
+    def _occurrences(self, sub):
+        """Unsorted start positions of every (overlapping) occurrence of sub."""
+        text, m = self.text, len(sub)
+        key = lambda i: text[i:i + m]
+        low = bisect_left(self.suffixes, sub, key=key)
+        high = bisect_right(self.suffixes, sub, lo=low, key=key)
+        return self.suffixes[low:high]
+
+    def positions(self, sub, start=None, end=None):
+        """Sorted start positions of every occurrence of sub inside text[start:end]."""
+        start, end = _bounds(len(self.text), start, end)
+        last = end - len(sub)
+        return sorted(i for i in self._occurrences(sub) if start <= i <= last)
+
+    def find(self, sub, start=None, end=None):
+        if not sub:
+            return self.text.find(sub, start, end)
+        return min(self.positions(sub, start, end), default=-1)
+
+    def rfind(self, sub, start=None, end=None):
+        if not sub:
+            return self.text.rfind(sub, start, end)
+        return max(self.positions(sub, start, end), default=-1)
+
+    def index(self, sub, start=None, end=None):
+        position = self.find(sub, start, end)
+        if position == -1:
+            raise ValueError("substring not found")
+        return position
+
+    def rindex(self, sub, start=None, end=None):
+        position = self.rfind(sub, start, end)
+        if position == -1:
+            raise ValueError("substring not found")
+        return position
+
+    def count(self, sub, start=None, end=None):
+        """Non-overlapping occurrences, like str.count."""
+        if not sub:
+            return self.text.count(sub, start, end)
+        total = 0
+        next_free = 0
+        for position in self.positions(sub, start, end):
+            if position >= next_free:
+                total += 1
+                next_free = position + len(sub)
+        return total
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    sent = "  happy holidays to you and your family  "
+    ac = AhoCorasick(["hol", "s", "e", "o"])
+    print(f"find:  {ac.find(sent, 5, -1)}  (str: {sent.find('hol', 5, -1)})")
+    print(f"rfind: {ac.rfind(sent, 7, -1)}  (str: {sent.rfind('hol', 7, -1)})")
+    print(f"count: {ac.count(sent, 0, -1)}  (str: {sent.count('s', 0, -1)})")
+    index = SuffixArray(sent)
+    print(f"suffix array rindex('o', 0, -1): {index.rindex('o', 0, -1)} (str: {sent.rindex('o', 0, -1)})")
+
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(4, 8))) for _ in range(2000)]
+    corpus = " ".join(rng.choice(words) for _ in range(200_000))
+    patterns = rng.sample(words, 1000)
+
+    started = time.perf_counter()
+    one_pass = AhoCorasick(patterns).count(corpus)
+    automaton = time.perf_counter() - started
+    started = time.perf_counter()
+    per_pattern = {pattern: corpus.count(pattern) for pattern in patterns}
+    looped = time.perf_counter() - started
+    assert one_pass == per_pattern
+    print(f"{len(patterns)} patterns over {len(corpus):,} chars: "
+          f"Aho-Corasick {automaton:.2f}s, str.count loop {looped:.2f}s")